@@ -127,7 +127,10 @@ async def predict_anomalies(
             features_list.append(features)
         
         # Get predictions from ensemble model
-        anomaly_predictions = await model.predict_anomalies(features_list)
+        anomaly_predictions = await model.predict_anomalies(
+            features_list,
+            explain=request.include_explanations
+        )
         morphing_predictions = await model.predict_morphing(features_list)
         
         # Format results
@@ -224,7 +227,7 @@ async def predict_single_entity(
         features = await _extract_features(entity)
         
         # Get predictions
-        anomaly_pred = await model.predict_anomalies([features])
+        anomaly_pred = await model.predict_anomalies([features], explain=include_explanation)
         morphing_pred = await model.predict_morphing([features])
         
         result = {
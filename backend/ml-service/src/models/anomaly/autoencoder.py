@@ -26,7 +26,7 @@ tf.get_logger().setLevel('ERROR')
 class AutoencoderModel:
     """Autoencoder model for detecting anomalous entity behavior using reconstruction error."""
     
-    def __init__(self, config: Optional[Dict[str, Any]] = None):
+    def __init__(self, config: Optional[Dict[str, Any]] = None, intra_op_threads: Optional[int] = None):
         """Initialize Autoencoder model."""
         self.config = config or model_config['anomaly_detection']['autoencoder']
         self.model = None
@@ -47,8 +47,12 @@ class AutoencoderModel:
         self.epochs = self.config.get('epochs', 100)
         self.batch_size = self.config.get('batch_size', 32)
         self.validation_split = self.config.get('validation_split', 0.2)
+        self.low_precision = self.config.get('low_precision', False)
         self.random_state = model_config['global']['random_state']
         
+        # bfloat16 copy of the trained network used for inference when low_precision is set
+        self._inference_model = None
+        
         # Training history
         self.training_history = None
         self.reconstruction_threshold = None
@@ -57,6 +61,14 @@ class AutoencoderModel:
         tf.random.set_seed(self.random_state)
         np.random.seed(self.random_state)
         
+        # Bound TensorFlow's op thread pool so it shares cores with the other models
+        if intra_op_threads:
+            try:
+                tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+            except RuntimeError:
+                # Thread pools are fixed once the TensorFlow runtime has started
+                logger.debug("TensorFlow already initialized, keeping its intra-op thread count")
+        
     def train(
         self,
         X: pd.DataFrame,
@@ -104,6 +116,7 @@ class AutoencoderModel:
             training_time = (datetime.now() - start_time).total_seconds()
             self.is_trained = True
             self.model_version = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self._inference_model = None
             
             # Calculate training metrics
             val_reconstructions = self.model.predict(X_val, verbose=0)
@@ -159,9 +172,12 @@ class AutoencoderModel:
         try:
             # Preprocess data
             X_scaled = self._preprocess_data(X, fit_scaler=False)
+            if self.low_precision:
+                # Half the bytes through the forward pass; errors are still computed in float32
+                X_scaled = X_scaled.astype(np.float32, copy=False)
             
             # Get reconstructions
-            reconstructions = self.model.predict(X_scaled, verbose=0)
+            reconstructions = self._get_inference_model().predict(X_scaled, verbose=0)
             
             # Calculate reconstruction errors
             reconstruction_errors = np.mean(np.square(X_scaled - reconstructions), axis=1)
@@ -289,6 +305,26 @@ class AutoencoderModel:
         
         return autoencoder
     
+    def _get_inference_model(self) -> Model:
+        """Return the network used for prediction, building the bfloat16 copy on first use."""
+        if not self.low_precision:
+            return self.model
+        
+        if self._inference_model is None:
+            def clone_layer(layer):
+                config = layer.get_config()
+                # The sigmoid reconstruction layer stays float32 for stable error values
+                if layer.name != 'output':
+                    config['dtype'] = 'mixed_bfloat16'
+                return layer.__class__.from_config(config)
+            
+            # Mixed precision keeps float32 variables, so the trained weights carry over as is
+            inference_model = keras.models.clone_model(self.model, clone_function=clone_layer)
+            inference_model.set_weights(self.model.get_weights())
+            self._inference_model = inference_model
+        
+        return self._inference_model
+    
     def _compile_model(self):
         """Compile the model with optimizer and loss function."""
         optimizer = keras.optimizers.Adam(learning_rate=self.learning_rate)
@@ -596,6 +632,7 @@ class AutoencoderModel:
         # Load TensorFlow model
         model_path = f"{filepath}_model"
         self.model = keras.models.load_model(model_path)
+        self._inference_model = None
         
         # Load encoder
         encoder_path = f"{filepath}_encoder"
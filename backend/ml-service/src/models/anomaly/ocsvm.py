@@ -3,21 +3,117 @@
 import numpy as np
 import pandas as pd
 from sklearn.svm import OneClassSVM
+from sklearn.linear_model import SGDOneClassSVM
+from sklearn.kernel_approximation import Nystroem
+from sklearn.pipeline import Pipeline, make_pipeline
 from sklearn.preprocessing import StandardScaler, RobustScaler
-from sklearn.model_selection import GridSearchCV
+from sklearn.metrics.pairwise import rbf_kernel
+from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report
 from typing import Dict, Any, List, Tuple, Optional
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+import os
+import pickle
 import joblib
+from joblib import Parallel, delayed
 import logging
+import time
 from datetime import datetime
 import mlflow
 import mlflow.sklearn
 
 from ...config import model_config
 from ...utils.explainability import ExplainabilityEngine
+from ...utils.persistence import joblib_compression, save_array
+from ...utils.jit import njit, prange, NUMBA_AVAILABLE, JIT_MIN_BATCH_SIZE
 
 logger = logging.getLogger(__name__)
 
+# Support vectors per block when building batch importance matrices; bounds the
+# (batch, block, features) difference tensor instead of materializing all SVs
+_SV_BLOCK_SIZE = 256
+
+# Hyperparameter search runs on a random subsample; libsvm fits scale
+# super-linearly with the number of rows
+_TUNING_MAX_SAMPLES = 5000
+_TUNING_HOLDOUT_FRACTION = 0.2
+
+# Kernel cache for libsvm fits (MB)
+_LIBSVM_CACHE_SIZE = 500
+
+# Largest (samples x support vectors) float32 kernel matrix evaluated directly
+_KERNEL_MATRIX_MAX_BYTES = 256 * 1024 * 1024
+
+# Landmark count for the Nystroem RBF approximation used by the SGD backend
+_NYSTROEM_COMPONENTS = 500
+
+# Explanation text templates
+_EXPLANATION_TEMPLATE = "Detected {severity} anomaly (score: {score:.3f}, decision score: {decision:.3f}). "
+_INDICATORS_TEMPLATE = "Key indicators: {}. "
+_PATTERNS_TEMPLATE = "Detected behaviors: {}."
+
+# Pattern rules checked in order: (name substring, pattern, comparison, threshold)
+_PATTERN_RULES = (
+    ('frequency', 'high_frequency_activity', '>', 100),
+    ('time', 'unusual_timing', '<', 0.1),
+    ('access', 'excessive_access_attempts', '>', 10),
+    ('error', 'high_error_rate', '>', 5),
+    ('network', 'unusual_network_behavior', None, None),
+    ('resource', 'resource_abuse', '>', 1000),
+)
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _sv_feature_importance(X, support_vectors):
+    """Mean absolute per-feature distance from each sample to all support vectors."""
+    n_samples, n_features = X.shape
+    n_sv = support_vectors.shape[0]
+    distances = np.zeros((n_samples, n_features), dtype=np.float64)
+
+    for i in prange(n_samples):
+        for s in range(n_sv):
+            for j in range(n_features):
+                distances[i, j] += abs(X[i, j] - support_vectors[s, j])
+        for j in range(n_features):
+            distances[i, j] /= n_sv
+
+    return distances
+
+# Single background worker so MLflow runs are logged one at a time, off the
+# training path (log_model pickles and uploads every support vector)
+_MLFLOW_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ocsvm-mlflow")
+
+
+def _log_to_mlflow(
+    model: Any,
+    params: Dict[str, Any],
+    metrics: Dict[str, Any],
+    run_name: str
+) -> None:
+    """Log a training run and its model to MLflow."""
+    try:
+        with mlflow.start_run(run_name=run_name):
+            mlflow.log_params(params)
+            mlflow.log_metrics(metrics)
+            mlflow.sklearn.log_model(model, "ocsvm_model")
+    except Exception as e:
+        logger.warning(f"MLflow logging failed for run {run_name}: {str(e)}")
+
+
+def _fit_and_score(
+    params: Dict[str, Any],
+    X_train: np.ndarray,
+    X_holdout: np.ndarray
+) -> float:
+    """Fit a One-Class SVM candidate and score it on held-out samples."""
+    try:
+        model = OneClassSVM(cache_size=_LIBSVM_CACHE_SIZE, **params).fit(X_train)
+        # Mean decision score on unseen data (higher is better for normal samples)
+        return float(np.mean(model.decision_function(X_holdout)))
+    except Exception:
+        return -np.inf
+
 
 class OneClassSVMModel:
     """One-Class SVM model for detecting anomalous entity behavior."""
@@ -37,11 +133,34 @@ class OneClassSVMModel:
         self.gamma = self.config.get('gamma', 'scale')
         self.nu = self.config.get('nu', 0.1)
         self.shrinking = self.config.get('shrinking', True)
+        self.backend = self.config.get('backend', 'libsvm')  # 'libsvm' or 'sgd' (linear time)
         self.random_state = model_config['global']['random_state']
         
         # Performance tracking
         self.training_time = None
-        self.support_vectors_count = None
+        self.support_vectors_count = None  # None for the Nystroem pipeline, which has no support vectors
+        self.n_landmarks = None  # Nystroem landmark count for the 'sgd' backend
+        
+        # Contiguous float32 copies of the support vectors and dual coefficients
+        # used by the inference and explanation kernels
+        self._sv = None
+        self._dual_coef = None
+        
+        # Collapsed weight vector and bias when the kernel is linear
+        self._w = None
+        self._b = None
+        
+        # Per-feature training medians used to impute missing values
+        self._impute_median = None
+        
+        # Per (feature, rule) value bounds derived from feature names; a rule
+        # fires when value > lower, value < upper, or it always applies
+        self._pattern_lower = None
+        self._pattern_upper = None
+        self._pattern_always = None
+        
+        # Feature name -> column position for building single-sample vectors
+        self._feature_index = {}
         
     def train(
         self,
@@ -54,15 +173,26 @@ class OneClassSVMModel:
         logger.info("Starting One-Class SVM training...")
         
         try:
-            start_time = datetime.now()
+            start_ns = time.perf_counter_ns()
             
             # Store feature names
             self.feature_names = list(X.columns)
+            self._feature_index = {name: i for i, name in enumerate(self.feature_names)}
+            self._build_pattern_tables()
             
             # Preprocess data
             X_scaled = self._preprocess_data(X, fit_scaler=True)
             
-            if hyperparameter_tuning:
+            if self.backend == 'sgd':
+                if hyperparameter_tuning:
+                    logger.warning("Hyperparameter tuning is not supported for the SGD backend, using config parameters")
+                
+                # Nystroem RBF feature map + linear one-class SVM, linear in sample count
+                self.model = self._build_sgd_pipeline(X_scaled)
+                
+                logger.info("Fitting SGD One-Class SVM pipeline...")
+                self.model.fit(X_scaled)
+            elif hyperparameter_tuning:
                 logger.info("Performing hyperparameter tuning...")
                 self.model = self._hyperparameter_tuning(X_scaled)
             else:
@@ -71,34 +201,36 @@ class OneClassSVMModel:
                     kernel=self.kernel,
                     gamma=self.gamma,
                     nu=self.nu,
-                    shrinking=self.shrinking
+                    shrinking=self.shrinking,
+                    cache_size=_LIBSVM_CACHE_SIZE
                 )
                 
                 # Fit the model
                 logger.info("Fitting One-Class SVM model...")
                 self.model.fit(X_scaled)
             
-            self.training_time = (datetime.now() - start_time).total_seconds()
-            self.support_vectors_count = len(self.model.support_vectors_)
+            self.training_time = (time.perf_counter_ns() - start_ns) / 1e9
+            self._cast_inference_arrays()
+            self._count_reference_vectors()
             self.is_trained = True
             self.model_version = datetime.now().strftime("%Y%m%d_%H%M%S")
             
             # Calculate training metrics
-            train_scores = self.model.decision_function(X_scaled)
-            train_predictions = self.model.predict(X_scaled)
+            train_scores = self._decision_function(X_scaled)
             
-            # Convert predictions (-1, 1) to (1, 0) for anomalies
-            train_anomalies = (train_predictions == -1).astype(int)
+            # Anomalies (1) vs normal (0) from the sign of the decision score
+            train_anomalies = self._scores_to_anomalies(train_scores).astype(int)
             
             metrics = {
                 "model_type": "one_class_svm",
-                "kernel": self.model.kernel,
-                "gamma": self.model.gamma,
-                "nu": self.model.nu,
+                "backend": self.backend,
+                **self._fitted_parameters(),
                 "training_samples": len(X),
                 "feature_count": len(self.feature_names),
-                "support_vectors": self.support_vectors_count,
-                "support_vector_ratio": self.support_vectors_count / len(X),
+                **({"n_landmarks": self.n_landmarks} if self.support_vectors_count is None else {
+                    "support_vectors": self.support_vectors_count,
+                    "support_vector_ratio": self.support_vectors_count / len(X)
+                }),
                 "anomaly_rate": np.mean(train_anomalies),
                 "mean_decision_score": np.mean(train_scores),
                 "std_decision_score": np.std(train_scores),
@@ -106,19 +238,23 @@ class OneClassSVMModel:
                 "model_version": self.model_version
             }
             
-            # Log to MLflow
-            with mlflow.start_run(run_name=f"ocsvm_{self.model_version}"):
-                mlflow.log_params({
+            # Log to MLflow in the background
+            _MLFLOW_EXECUTOR.submit(
+                _log_to_mlflow,
+                self.model,
+                {
                     "kernel": self.kernel,
                     "gamma": self.gamma,
                     "nu": self.nu,
-                    "shrinking": self.shrinking
-                })
-                mlflow.log_metrics(metrics)
-                mlflow.sklearn.log_model(self.model, "ocsvm_model")
+                    "shrinking": self.shrinking,
+                    "backend": self.backend
+                },
+                dict(metrics),
+                f"ocsvm_{self.model_version}"
+            )
             
             logger.info(f"One-Class SVM training completed in {self.training_time:.2f}s. "
-                       f"Support vectors: {self.support_vectors_count}, "
+                       f"Support vectors: {self.support_vectors_count}, Landmarks: {self.n_landmarks}, "
                        f"Anomaly rate: {metrics['anomaly_rate']:.3f}")
             
             return metrics
@@ -127,74 +263,91 @@ class OneClassSVMModel:
             logger.error(f"Training failed: {str(e)}")
             raise
     
-    def predict(self, X: pd.DataFrame) -> Dict[str, Any]:
-        """Predict anomalies for input data."""
+    def predict(self, X: pd.DataFrame, return_numpy: bool = False) -> Dict[str, Any]:
+        """Predict anomalies for input data; ``return_numpy`` keeps per-sample arrays as ndarrays."""
         if not self.is_trained:
             raise ValueError("Model must be trained before making predictions")
         
         try:
-            # Preprocess data
-            X_scaled = self._preprocess_data(X, fit_scaler=False)
-            
-            # Get predictions and decision scores
-            predictions = self.model.predict(X_scaled)
-            decision_scores = self.model.decision_function(X_scaled)
-            
-            # Convert to anomaly probabilities (0-1 scale)
-            anomaly_scores = self._convert_scores_to_probabilities(decision_scores)
-            
-            # Convert predictions (-1, 1) to boolean anomalies
-            is_anomaly = (predictions == -1)
-            
-            # Generate explanations for anomalies
-            explanations = []
-            patterns = []
-            
-            for i, (score, is_anom) in enumerate(zip(anomaly_scores, is_anomaly)):
-                if is_anom:
-                    explanation = self._generate_explanation(
-                        X.iloc[i], 
-                        X_scaled[i], 
-                        score,
-                        decision_scores[i]
-                    )
-                    explanations.append(explanation)
-                    patterns.append(explanation.get('detected_patterns', []))
-                else:
-                    explanations.append(None)
-                    patterns.append([])
-            
-            results = {
-                'scores': anomaly_scores.tolist(),
-                'predictions': is_anomaly.tolist(),
-                'decision_scores': decision_scores.tolist(),
-                'explanations': explanations,
-                'patterns': patterns,
-                'confidence': self._calculate_confidence(decision_scores, anomaly_scores),
-                'model_version': self.model_version
-            }
-            
-            return results
+            # Convert once to a float32 array in training column order
+            return self._predict_values(
+                X[self.feature_names].to_numpy(dtype=np.float32),
+                return_numpy=return_numpy
+            )
             
         except Exception as e:
             logger.error(f"Prediction failed: {str(e)}")
             raise
     
+    def _predict_values(self, X_values: np.ndarray, return_numpy: bool = False) -> Dict[str, Any]:
+        """Predict anomalies for a float32 feature matrix in training column order."""
+        # Preprocess data
+        X_scaled = self._preprocess_data(X_values, fit_scaler=False)
+        
+        # Get decision scores; predictions follow from their sign
+        decision_scores = self._decision_function(X_scaled)
+        
+        # Convert to anomaly probabilities (0-1 scale)
+        anomaly_scores = self._convert_scores_to_probabilities(decision_scores)
+        
+        # Boolean anomalies, matching model.predict == -1
+        is_anomaly = self._scores_to_anomalies(decision_scores)
+        
+        # Only anomalous rows are explained
+        anomaly_indices = np.flatnonzero(is_anomaly)
+        
+        # Per-sample feature importance for all anomalous rows in one pass
+        importance_matrix = self._calculate_importance_matrix(X_scaled[anomaly_indices])
+        
+        # Generate explanations for anomalies
+        explanations = [None] * len(decision_scores)
+        patterns = [[] for _ in range(len(decision_scores))]
+        
+        for row, i in enumerate(anomaly_indices):
+            explanation = self._generate_explanation(
+                X_values[i], 
+                importance_matrix[row], 
+                anomaly_scores[i],
+                decision_scores[i]
+            )
+            explanations[i] = explanation
+            patterns[i] = explanation.get('detected_patterns', [])
+        
+        confidence = self._calculate_confidence(decision_scores, anomaly_scores)
+        
+        # Python lists only when the caller serializes the result
+        if not return_numpy:
+            anomaly_scores = anomaly_scores.tolist()
+            is_anomaly = is_anomaly.tolist()
+            decision_scores = decision_scores.tolist()
+            confidence = confidence.tolist()
+        
+        results = {
+            'scores': anomaly_scores,
+            'predictions': is_anomaly,
+            'decision_scores': decision_scores,
+            'explanations': explanations,
+            'patterns': patterns,
+            'confidence': confidence,
+            'model_version': self.model_version
+        }
+        
+        return results
+    
     def predict_single(self, features: Dict[str, Any]) -> Dict[str, Any]:
         """Predict anomaly for a single entity."""
-        # Convert to DataFrame
-        X = pd.DataFrame([features])
-        
-        # Ensure all expected features are present
-        for feature in self.feature_names:
-            if feature not in X.columns:
-                X[feature] = 0  # Default value for missing features
+        if not self.is_trained:
+            raise ValueError("Model must be trained before making predictions")
         
-        # Reorder columns to match training data
-        X = X[self.feature_names]
+        # Build the feature vector directly; missing features default to 0
+        vec = np.zeros(len(self.feature_names), dtype=np.float32)
+        for name, value in features.items():
+            idx = self._feature_index.get(name)
+            if idx is not None:
+                vec[idx] = np.nan if value is None else value
         
         # Get prediction
-        result = self.predict(X)
+        result = self._predict_values(vec[None, :])
         
         # Return single result
         return {
@@ -206,71 +359,188 @@ class OneClassSVMModel:
             'patterns': result['patterns'][0]
         }
     
-    def _preprocess_data(self, X: pd.DataFrame, fit_scaler: bool = False) -> np.ndarray:
+    def _decision_function(self, X_scaled: np.ndarray) -> np.ndarray:
+        """Compute decision scores, evaluating RBF kernels as a single matrix product when it fits."""
+        if self._w is not None:
+            # Linear kernel: sum_i alpha_i * <x, sv_i> - rho == x @ w + b
+            scores = (X_scaled.astype(np.float32, copy=False) @ self._w).astype(np.float64)
+            scores += self._b
+            return scores
+        
+        if (
+            isinstance(self.model, OneClassSVM)
+            and self.model.kernel == 'rbf'
+            and X_scaled.shape[0] * len(self._sv) * 4 <= _KERNEL_MATRIX_MAX_BYTES
+        ):
+            # sum_i alpha_i * K(x, sv_i) - rho without libsvm's per-sample dispatch
+            kernel = rbf_kernel(
+                X_scaled.astype(np.float32, copy=False), self._sv, gamma=self.model._gamma
+            )
+            scores = (kernel @ self._dual_coef).astype(np.float64)
+            scores += self.model.intercept_[0]
+            return scores
+        
+        return self.model.decision_function(X_scaled)
+    
+    def _scores_to_anomalies(self, decision_scores: np.ndarray) -> np.ndarray:
+        """Boolean anomaly mask from decision scores, matching each backend's predict."""
+        if isinstance(self.model, Pipeline):
+            # SGDOneClassSVM labels scores >= 0 as normal
+            return decision_scores < 0
+        # libsvm labels only scores > 0 as normal
+        return decision_scores <= 0
+    
+    def _preprocess_data(self, X: Any, fit_scaler: bool = False) -> np.ndarray:
         """Preprocess input data."""
-        # Handle missing values
-        X_clean = X.fillna(X.median())  # Use median for robustness
+        X_array = np.asarray(X, dtype=np.float32)
+        finite = np.isfinite(X_array)
         
-        # Handle infinite values
-        X_clean = X_clean.replace([np.inf, -np.inf], np.nan)
-        X_clean = X_clean.fillna(X_clean.median())
+        if fit_scaler:
+            # Training medians are reused at inference for consistent imputation
+            self._impute_median = np.nan_to_num(
+                np.nanmedian(np.where(finite, X_array, np.nan), axis=0)
+            ).astype(np.float32)
+        
+        # Replace missing and infinite values with the median (robust to outliers)
+        if not finite.all():
+            median = self._impute_median
+            if median is None:
+                # Models saved before medians were persisted impute per batch
+                median = np.nan_to_num(np.nanmedian(np.where(finite, X_array, np.nan), axis=0))
+            X_array = np.where(finite, X_array, median).astype(np.float32, copy=False)
         
         # Scale features using RobustScaler (more robust to outliers)
         if fit_scaler:
-            X_scaled = self.scaler.fit_transform(X_clean)
+            X_scaled = self.scaler.fit_transform(X_array)
         else:
-            X_scaled = self.scaler.transform(X_clean)
+            # Apply the fitted centering/scaling directly, skipping sklearn input validation
+            if self.scaler.center_ is not None:
+                X_scaled = X_array - self.scaler.center_
+            else:
+                X_scaled = X_array.copy()
+            if self.scaler.scale_ is not None:
+                X_scaled /= self.scaler.scale_
         
         return X_scaled
     
     def _hyperparameter_tuning(self, X: np.ndarray) -> OneClassSVM:
-        """Perform hyperparameter tuning using GridSearchCV."""
+        """Perform parallel hyperparameter search on a training subsample."""
         param_grid = {
             'kernel': ['rbf', 'poly', 'sigmoid'],
             'gamma': ['scale', 'auto', 0.001, 0.01, 0.1, 1],
             'nu': [0.01, 0.05, 0.1, 0.2, 0.3]
         }
+        candidates = [
+            dict(zip(param_grid.keys(), values))
+            for values in itertools.product(*param_grid.values())
+        ]
+        
+        # Search on a bounded subsample with a held-out split for scoring
+        rng = np.random.RandomState(self.random_state)
+        if len(X) > _TUNING_MAX_SAMPLES:
+            X_sub = X[rng.choice(len(X), _TUNING_MAX_SAMPLES, replace=False)]
+        else:
+            X_sub = X
+        X_train, X_holdout = train_test_split(
+            X_sub,
+            test_size=_TUNING_HOLDOUT_FRACTION,
+            random_state=self.random_state
+        )
         
-        # Create base model
-        base_model = OneClassSVM()
-        
-        # Custom scoring function for unsupervised learning
-        def ocsvm_scorer(estimator, X):
-            # Return mean decision score (higher is better for normal samples)
-            scores = estimator.decision_function(X)
-            return np.mean(scores)
-        
-        # Perform grid search
-        grid_search = GridSearchCV(
-            base_model,
-            param_grid,
-            scoring=ocsvm_scorer,
-            cv=3,  # Use 3-fold CV for unsupervised learning
-            verbose=1,
-            n_jobs=-1
+        logger.info(f"Evaluating {len(candidates)} candidates on {len(X_train)} samples...")
+        scores = Parallel(n_jobs=-1, backend='loky')(
+            delayed(_fit_and_score)(params, X_train, X_holdout)
+            for params in candidates
         )
         
-        grid_search.fit(X)
+        best_index = int(np.argmax(scores))
+        best_params = candidates[best_index]
+        
+        logger.info(f"Best parameters: {best_params}")
+        logger.info(f"Best score: {scores[best_index]}")
+        
+        # Refit the selected configuration on the full training set
+        best_model = OneClassSVM(
+            shrinking=self.shrinking,
+            cache_size=_LIBSVM_CACHE_SIZE,
+            **best_params
+        )
+        best_model.fit(X)
+        
+        return best_model
+    
+    def _build_sgd_pipeline(self, X: np.ndarray) -> Pipeline:
+        """Build the Nystroem + SGDOneClassSVM approximation of the RBF model."""
+        gamma = self.gamma
+        if gamma == 'scale':
+            variance = float(X.var())
+            gamma = 1.0 / (X.shape[1] * variance) if variance > 0 else 1.0
+        elif gamma == 'auto':
+            gamma = 1.0 / X.shape[1]
+        
+        return make_pipeline(
+            Nystroem(
+                kernel='rbf',
+                gamma=gamma,
+                n_components=min(_NYSTROEM_COMPONENTS, len(X)),
+                random_state=self.random_state
+            ),
+            SGDOneClassSVM(nu=self.nu, random_state=self.random_state)
+        )
+    
+    def _cast_inference_arrays(self) -> None:
+        """Keep float32 copies of arrays read on every inference call to halve memory traffic."""
+        self._sv = np.ascontiguousarray(self._reference_vectors(), dtype=np.float32)
+        self._dual_coef = (
+            np.ascontiguousarray(self.model.dual_coef_.ravel(), dtype=np.float32)
+            if isinstance(self.model, OneClassSVM) else None
+        )
         
-        logger.info(f"Best parameters: {grid_search.best_params_}")
-        logger.info(f"Best score: {grid_search.best_score_}")
+        if isinstance(self.model, OneClassSVM) and self.model.kernel == 'linear':
+            self._w = (self.model.dual_coef_.ravel()[:, None] * self.model.support_vectors_).sum(axis=0)
+            self._w = self._w.astype(np.float32)
+            self._b = float(self.model.intercept_[0])
+        else:
+            self._w = self._b = None
         
-        return grid_search.best_estimator_
+        # RobustScaler.transform accepts float32 statistics and keeps float32 input as is
+        if self.scaler.center_ is not None:
+            self.scaler.center_ = self.scaler.center_.astype(np.float32)
+        if self.scaler.scale_ is not None:
+            self.scaler.scale_ = self.scaler.scale_.astype(np.float32)
+    
+    def _reference_vectors(self) -> np.ndarray:
+        """Points explanations are measured against: support vectors or Nystroem landmarks."""
+        if isinstance(self.model, Pipeline):
+            return self.model.named_steps['nystroem'].components_
+        return self.model.support_vectors_
+    
+    def _count_reference_vectors(self) -> None:
+        """Record the support vector count, or the landmark count for the Nystroem pipeline."""
+        n_reference = len(self._reference_vectors())
+        if isinstance(self.model, Pipeline):
+            self.support_vectors_count, self.n_landmarks = None, n_reference
+        else:
+            self.support_vectors_count, self.n_landmarks = n_reference, None
+    
+    def _fitted_parameters(self) -> Dict[str, Any]:
+        """Kernel parameters of the fitted model."""
+        if isinstance(self.model, Pipeline):
+            return {
+                'kernel': 'rbf',
+                'gamma': self.model.named_steps['nystroem'].gamma,
+                'nu': self.model.named_steps['sgdoneclasssvm'].nu
+            }
+        return {'kernel': self.model.kernel, 'gamma': self.model.gamma, 'nu': self.model.nu}
     
     def _convert_scores_to_probabilities(self, decision_scores: np.ndarray) -> np.ndarray:
         """Convert SVM decision scores to anomaly probabilities."""
         # SVM decision scores: positive = normal, negative = anomaly
-        # We need to convert to 0-1 probabilities where 1 = high anomaly probability
-        
-        # Use sigmoid transformation to convert to probabilities
-        # Invert scores so negative (anomaly) becomes high probability
-        inverted_scores = -decision_scores
-        
-        # Apply sigmoid transformation
-        probabilities = 1 / (1 + np.exp(-inverted_scores))
-        
-        # Ensure probabilities are in [0, 1] range
-        probabilities = np.clip(probabilities, 0, 1)
+        # Sigmoid of the inverted score maps anomalies to high probability;
+        # the result is already within [0, 1]
+        probabilities = np.exp(decision_scores)
+        probabilities += 1.0
+        np.reciprocal(probabilities, out=probabilities)
         
         return probabilities
     
@@ -278,50 +548,41 @@ class OneClassSVMModel:
         self, 
         decision_scores: np.ndarray, 
         anomaly_scores: np.ndarray
-    ) -> List[float]:
+    ) -> np.ndarray:
         """Calculate confidence scores for predictions."""
-        confidence_scores = []
-        
-        for decision_score, anomaly_score in zip(decision_scores, anomaly_scores):
-            # Confidence based on distance from decision boundary
-            # Higher absolute decision scores = higher confidence
-            abs_decision_score = abs(decision_score)
-            
-            # Map to confidence (0-1)
-            if abs_decision_score > 2.0:  # Very confident
-                confidence = 0.95
-            elif abs_decision_score > 1.0:  # Confident
-                confidence = 0.7 + (abs_decision_score - 1.0) * 0.25
-            elif abs_decision_score > 0.5:  # Moderately confident
-                confidence = 0.5 + (abs_decision_score - 0.5) * 0.4
-            else:  # Low confidence
-                confidence = 0.3 + abs_decision_score * 0.4
-            
-            confidence_scores.append(min(confidence, 0.95))
+        # Confidence based on distance from decision boundary
+        # Higher absolute decision scores = higher confidence
+        abs_scores = np.abs(decision_scores)
+        
+        # Piecewise-linear map to confidence (0-1)
+        confidence = np.select(
+            [abs_scores > 2.0, abs_scores > 1.0, abs_scores > 0.5],
+            [0.95, 0.7 + (abs_scores - 1.0) * 0.25, 0.5 + (abs_scores - 0.5) * 0.4],
+            default=0.3 + abs_scores * 0.4
+        )
+        np.minimum(confidence, 0.95, out=confidence)
         
-        return confidence_scores
+        return confidence
     
     def _generate_explanation(
         self,
-        original_features: pd.Series,
-        scaled_features: np.ndarray,
+        original_features: np.ndarray,
+        feature_importance: np.ndarray,
         anomaly_score: float,
         decision_score: float
     ) -> Dict[str, Any]:
         """Generate explanation for anomaly detection."""
         try:
-            # Calculate feature importance using support vectors
-            feature_importance = self._calculate_feature_importance(scaled_features)
-            
             # Identify top contributing features
-            top_features = sorted(
-                zip(self.feature_names, feature_importance),
-                key=lambda x: x[1],
-                reverse=True
-            )[:5]
+            top_indices = np.argsort(-feature_importance, kind='stable')[:5]
+            top_features = [
+                (self.feature_names[i], feature_importance[i]) for i in top_indices
+            ]
             
             # Detect patterns based on feature analysis
-            detected_patterns = self._detect_patterns(original_features, top_features)
+            detected_patterns = self._detect_patterns(
+                original_features, top_indices, feature_importance[top_indices]
+            )
             
             # Generate human-readable explanation
             explanation_text = self._generate_explanation_text(
@@ -353,66 +614,68 @@ class OneClassSVMModel:
     def _calculate_feature_importance(self, features: np.ndarray) -> np.ndarray:
         """Calculate feature importance based on support vectors."""
         try:
-            # Get support vectors
-            support_vectors = self.model.support_vectors_
-            
-            if len(support_vectors) == 0:
-                return np.ones(len(features)) / len(features)
-            
-            # Calculate distance to support vectors for each feature
-            distances = []
-            for i in range(len(features)):
-                feature_distances = []
-                for sv in support_vectors:
-                    # Calculate distance for this feature dimension
-                    dist = abs(features[i] - sv[i])
-                    feature_distances.append(dist)
-                
-                # Use mean distance as importance indicator
-                distances.append(np.mean(feature_distances))
-            
-            distances = np.array(distances)
-            
-            # Normalize to get importance scores
-            if np.sum(distances) > 0:
-                importance = distances / np.sum(distances)
-            else:
-                importance = np.ones_like(distances) / len(distances)
-            
-            return importance
+            return self._calculate_importance_matrix(features[None, :])[0]
             
         except Exception as e:
             logger.warning(f"Failed to calculate feature importance: {str(e)}")
             # Fallback to uniform importance
             return np.ones(len(features)) / len(features)
     
+    def _calculate_importance_matrix(self, X_scaled: np.ndarray) -> np.ndarray:
+        """Calculate normalized feature importance for every row of a batch."""
+        n_samples, n_features = X_scaled.shape
+        support_vectors = self._sv if self._sv is not None else self.model.support_vectors_
+        n_sv = len(support_vectors)
+        
+        if n_sv == 0:
+            return np.full((n_samples, n_features), 1.0 / n_features)
+        
+        X_scaled = X_scaled.astype(support_vectors.dtype, copy=False)
+        if NUMBA_AVAILABLE and n_samples * n_sv >= JIT_MIN_BATCH_SIZE:
+            distances = _sv_feature_importance(np.ascontiguousarray(X_scaled), support_vectors)
+        else:
+            # Accumulate |x - sv| over blocks of support vectors to bound memory
+            X_block = X_scaled[:, None, :]
+            distances = np.zeros((n_samples, n_features), dtype=np.float64)
+            for start in range(0, n_sv, _SV_BLOCK_SIZE):
+                block = support_vectors[None, start:start + _SV_BLOCK_SIZE, :]
+                distances += np.abs(X_block - block).sum(axis=1)
+            distances /= n_sv
+        
+        # Normalize each row, falling back to uniform importance for zero rows
+        totals = distances.sum(axis=1, keepdims=True)
+        importance = np.divide(
+            distances, totals,
+            out=np.full_like(distances, 1.0 / n_features),
+            where=totals > 0
+        )
+        
+        return importance
+    
     def _detect_patterns(
         self, 
-        original_features: pd.Series, 
-        top_features: List[Tuple[str, float]]
+        original_features: np.ndarray, 
+        top_indices: np.ndarray,
+        top_importance: np.ndarray
     ) -> List[str]:
         """Detect anomaly patterns based on feature analysis."""
-        patterns = []
+        # Significant contribution threshold
+        significant = top_indices[top_importance > 0.15]
+        
+        # Evaluate every name-matched rule for the significant features at once
+        values = original_features[significant][:, None]
+        hits = (
+            self._pattern_always[significant]
+            | (values > self._pattern_lower[significant])
+            | (values < self._pattern_upper[significant])
+        )
+        first_hit = hits.argmax(axis=1)
         
-        for feature_name, importance in top_features:
-            if importance > 0.15:  # Significant contribution threshold
-                value = original_features[feature_name]
-                
-                # Pattern detection based on feature names and values
-                if 'frequency' in feature_name.lower() and value > 100:
-                    patterns.append('high_frequency_activity')
-                elif 'time' in feature_name.lower() and value < 0.1:
-                    patterns.append('unusual_timing')
-                elif 'access' in feature_name.lower() and value > 10:
-                    patterns.append('excessive_access_attempts')
-                elif 'error' in feature_name.lower() and value > 5:
-                    patterns.append('high_error_rate')
-                elif 'network' in feature_name.lower():
-                    patterns.append('unusual_network_behavior')
-                elif 'resource' in feature_name.lower() and value > 1000:
-                    patterns.append('resource_abuse')
-                else:
-                    patterns.append(f'unusual_{feature_name}')
+        # First matching rule wins, as in an if/elif chain
+        patterns = [
+            _PATTERN_RULES[rule_id][1] if hit else f'unusual_{self.feature_names[i]}'
+            for i, rule_id, hit in zip(significant, first_hit, hits.any(axis=1))
+        ]
         
         # Add general patterns based on decision score
         if len(patterns) == 0:
@@ -420,6 +683,24 @@ class OneClassSVMModel:
         
         return patterns[:5]  # Limit to top 5 patterns
     
+    def _build_pattern_tables(self) -> None:
+        """Precompute per-feature rule bounds so inference does no substring matching."""
+        shape = (len(self.feature_names), len(_PATTERN_RULES))
+        self._pattern_lower = np.full(shape, np.inf, dtype=np.float32)
+        self._pattern_upper = np.full(shape, -np.inf, dtype=np.float32)
+        self._pattern_always = np.zeros(shape, dtype=bool)
+        
+        for i, name in enumerate(self.feature_names):
+            for rule_id, (substring, _, comparison, threshold) in enumerate(_PATTERN_RULES):
+                if substring not in name.lower():
+                    continue
+                if comparison == '>':
+                    self._pattern_lower[i, rule_id] = threshold
+                elif comparison == '<':
+                    self._pattern_upper[i, rule_id] = threshold
+                else:
+                    self._pattern_always[i, rule_id] = True
+    
     def _generate_explanation_text(
         self,
         top_features: List[Tuple[str, float]],
@@ -435,17 +716,17 @@ class OneClassSVMModel:
         else:
             severity = "low"
         
-        explanation = f"Detected {severity} anomaly (score: {anomaly_score:.3f}, "
-        explanation += f"decision score: {decision_score:.3f}). "
+        parts = [_EXPLANATION_TEMPLATE.format(
+            severity=severity, score=anomaly_score, decision=decision_score
+        )]
         
         if top_features:
-            top_feature_names = [f[0] for f in top_features[:3]]
-            explanation += f"Key indicators: {', '.join(top_feature_names)}. "
+            parts.append(_INDICATORS_TEMPLATE.format(', '.join(f[0] for f in top_features[:3])))
         
         if patterns:
-            explanation += f"Detected behaviors: {', '.join(patterns[:3])}."
+            parts.append(_PATTERNS_TEMPLATE.format(', '.join(patterns[:3])))
         
-        return explanation
+        return ''.join(parts)
     
     def save_model(self, filepath: str) -> None:
         """Save the trained model to disk."""
@@ -460,10 +741,22 @@ class OneClassSVMModel:
             'model_version': self.model_version,
             'is_trained': self.is_trained,
             'training_time': self.training_time,
-            'support_vectors_count': self.support_vectors_count
+            'support_vectors_count': self.support_vectors_count,
+            'n_landmarks': self.n_landmarks,
+            'impute_median': self._impute_median
         }
         
-        joblib.dump(model_data, filepath)
+        joblib.dump(
+            model_data,
+            filepath,
+            compress=joblib_compression(3),
+            protocol=pickle.HIGHEST_PROTOCOL
+        )
+        
+        # Uncompressed float32 support vectors next to the pickle so workers can
+        # memory-map them and share one copy through the page cache
+        save_array(self._support_vectors_path(filepath), self._sv)
+        
         logger.info(f"Model saved to {filepath}")
     
     def load_model(self, filepath: str) -> None:
@@ -477,10 +770,24 @@ class OneClassSVMModel:
         self.model_version = model_data['model_version']
         self.is_trained = model_data['is_trained']
         self.training_time = model_data.get('training_time')
-        self.support_vectors_count = model_data.get('support_vectors_count')
+        self.backend = 'sgd' if isinstance(self.model, Pipeline) else 'libsvm'
+        self._cast_inference_arrays()
+        self._count_reference_vectors()
+        self._impute_median = model_data.get('impute_median')
+        self._feature_index = {name: i for i, name in enumerate(self.feature_names)}
+        self._build_pattern_tables()
+        
+        sv_path = self._support_vectors_path(filepath)
+        if os.path.exists(sv_path):
+            self._sv = np.load(sv_path, mmap_mode='r')
         
         logger.info(f"Model loaded from {filepath}")
     
+    @staticmethod
+    def _support_vectors_path(filepath: str) -> str:
+        """Path of the memory-mappable support vector array saved alongside a model."""
+        return f"{filepath}.sv.npy"
+    
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about the model."""
         return {
@@ -492,10 +799,12 @@ class OneClassSVMModel:
             'config': self.config,
             'training_time_seconds': self.training_time,
             'support_vectors_count': self.support_vectors_count,
+            'n_landmarks': self.n_landmarks,
             'parameters': {
                 'kernel': self.kernel,
                 'gamma': self.gamma,
                 'nu': self.nu,
-                'shrinking': self.shrinking
+                'shrinking': self.shrinking,
+                'backend': self.backend
             } if self.model else None
         }
@@ -1,6 +1,7 @@
 """Model calibration for stable, comparable anomaly scores."""
 
 import numpy as np
+from scipy.optimize import minimize
 from sklearn.isotonic import IsotonicRegression
 from sklearn.preprocessing import StandardScaler
 from typing import Optional, Tuple
@@ -13,13 +14,31 @@ logger = logging.getLogger(__name__)
 class AnomalyScoreCalibrator:
     """Calibrate anomaly scores to stable 0-1 probability range."""
     
-    def __init__(self):
-        """Initialize calibrator."""
+    def __init__(self, method: str = 'isotonic'):
+        """
+        Initialize calibrator.
+        
+        Args:
+            method: 'isotonic' (step function) or 'sigmoid' (two-parameter,
+                O(1) memory and evaluation cost)
+        """
+        if method not in ('isotonic', 'sigmoid'):
+            raise ValueError(f"Unknown calibration method: {method}")
+        
+        self.method = method
         self.calibrator = IsotonicRegression(out_of_bounds='clip')
         self.scaler = StandardScaler()
         self.is_fitted = False
         self.calibration_metadata = {}
         
+        # Isotonic knots for evaluating the fitted step function with np.interp
+        self._x_knots = None
+        self._y_knots = None
+        
+        # Sigmoid parameters: p = 1 / (1 + exp(a * s + b))
+        self._a = None
+        self._b = None
+        
     def fit(self, raw_scores: np.ndarray, y_true: Optional[np.ndarray] = None) -> 'AnomalyScoreCalibrator':
         """
         Fit calibrator on validation data.
@@ -37,7 +56,7 @@ class AnomalyScoreCalibrator:
                 if len(raw_scores) != len(y_true):
                     raise ValueError("raw_scores and y_true must have same length")
                 
-                self.calibrator.fit(raw_scores, y_true)
+                self._fit_mapping(raw_scores, y_true)
                 self.calibration_metadata['method'] = 'supervised'
                 self.calibration_metadata['n_samples'] = len(raw_scores)
                 self.calibration_metadata['n_anomalies'] = int(y_true.sum())
@@ -45,11 +64,16 @@ class AnomalyScoreCalibrator:
             else:
                 # Unsupervised calibration using ECDF (empirical CDF)
                 # Maps raw scores to percentile ranks
-                ranks = np.argsort(np.argsort(raw_scores)) / (len(raw_scores) - 1)
-                self.calibrator.fit(raw_scores, ranks)
+                # Single argsort; ranks come from inverting the permutation
+                order = np.argsort(raw_scores, kind='stable')
+                ranks = np.empty(len(raw_scores), dtype=np.float64)
+                ranks[order] = np.arange(len(raw_scores))
+                ranks /= len(raw_scores) - 1
+                self._fit_mapping(raw_scores, ranks)
                 self.calibration_metadata['method'] = 'unsupervised_ecdf'
                 self.calibration_metadata['n_samples'] = len(raw_scores)
             
+            self.calibration_metadata['calibration'] = self.method
             self.is_fitted = True
             logger.info(f"Calibrator fitted: {self.calibration_metadata}")
             return self
@@ -73,13 +97,54 @@ class AnomalyScoreCalibrator:
         
         try:
             raw_scores = np.asarray(raw_scores).flatten()
-            calibrated = self.calibrator.predict(raw_scores)
-            return np.clip(calibrated, 0.0, 1.0)
+            if self.method == 'sigmoid':
+                calibrated = np.exp(self._a * raw_scores + self._b)
+                calibrated += 1.0
+                return np.reciprocal(calibrated, out=calibrated)
+            
+            if self._x_knots is None:
+                self._extract_knots()
+            # Equivalent to IsotonicRegression.predict with clipping at the ends
+            calibrated = np.interp(raw_scores, self._x_knots, self._y_knots)
+            return np.clip(calibrated, 0.0, 1.0, out=calibrated)
             
         except Exception as e:
             logger.error(f"Calibration transform failed: {str(e)}")
             raise
     
+    def _fit_mapping(self, raw_scores: np.ndarray, targets: np.ndarray) -> None:
+        """Fit the configured score -> probability mapping."""
+        if self.method == 'sigmoid':
+            self._fit_sigmoid(raw_scores, targets)
+        else:
+            self.calibrator.fit(raw_scores, targets)
+            self._extract_knots()
+    
+    def _fit_sigmoid(self, raw_scores: np.ndarray, targets: np.ndarray) -> None:
+        """Fit sigmoid parameters by minimizing binary cross-entropy."""
+        scores = raw_scores.astype(np.float64)
+        targets = np.clip(targets.astype(np.float64), 0.0, 1.0)
+        
+        def loss_and_grad(params):
+            a, b = params
+            z = a * scores + b
+            # p = sigmoid(-z); log-loss written with logaddexp for stability
+            loss = np.mean(targets * np.logaddexp(0.0, z) + (1.0 - targets) * np.logaddexp(0.0, -z))
+            residual = targets - 1.0 / (1.0 + np.exp(z))  # d(loss)/dz per sample
+            return loss, np.array([np.mean(residual * scores), np.mean(residual)])
+        
+        # Start from a standardized mapping increasing in the raw score
+        std = scores.std() or 1.0
+        initial = np.array([-1.0 / std, scores.mean() / std])
+        result = minimize(loss_and_grad, initial, jac=True, method='L-BFGS-B')
+        
+        self._a, self._b = np.float32(result.x[0]), np.float32(result.x[1])
+    
+    def _extract_knots(self) -> None:
+        """Cache the fitted isotonic thresholds for fast interpolation."""
+        self._x_knots = np.asarray(self.calibrator.X_thresholds_, dtype=np.float64)
+        self._y_knots = np.asarray(self.calibrator.y_thresholds_, dtype=np.float64)
+    
     def fit_transform(self, raw_scores: np.ndarray, y_true: Optional[np.ndarray] = None) -> np.ndarray:
         """Fit and transform in one step."""
         self.fit(raw_scores, y_true)
@@ -89,6 +154,8 @@ class AnomalyScoreCalibrator:
         """Save calibrator to disk."""
         try:
             joblib.dump({
+                'method': self.method,
+                'sigmoid_params': (self._a, self._b),
                 'calibrator': self.calibrator,
                 'scaler': self.scaler,
                 'is_fitted': self.is_fitted,
@@ -107,6 +174,10 @@ class AnomalyScoreCalibrator:
             self.scaler = data['scaler']
             self.is_fitted = data['is_fitted']
             self.calibration_metadata = data['metadata']
+            self.method = data.get('method', 'isotonic')
+            self._a, self._b = data.get('sigmoid_params', (None, None))
+            if self.is_fitted and self.method == 'isotonic':
+                self._extract_knots()
             logger.info(f"Calibrator loaded from {filepath}")
             return self
         except Exception as e:
@@ -2,11 +2,17 @@
 
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Tuple, Union
 import logging
 from datetime import datetime
 import asyncio
+import copy
+import hashlib
+import json
+import os
 import joblib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 from .anomaly.isolation_forest import IsolationForestModel
 from .anomaly.ocsvm import OneClassSVMModel
@@ -21,10 +27,158 @@ from .morphing.entity_morphing_detector import EntityMorphingDetector
 from .morphing.behavioral_drift import BehavioralDriftDetector
 from .calibration import AnomalyScoreCalibrator
 from ..config import model_config
+from ..utils.jit import njit, prange, NUMBA_AVAILABLE, JIT_MIN_BATCH_SIZE
 from ..config.version import MODEL_VERSION, get_version_metadata
 
 logger = logging.getLogger(__name__)
 
+# orjson is optional - metadata falls back to the stdlib encoder
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Combination modes understood by _combine_kernel
+_SOFT_UNIFORM, _SOFT_WEIGHTED, _HARD = 0, 1, 2
+
+
+@njit(parallel=True, fastmath=True, cache=True, nogil=True)
+def _combine_kernel(scores, confidences, weights, mode, threshold):
+    """Combine (models, samples) score and confidence matrices column by column."""
+    n_models, n_samples = scores.shape
+    raw = np.empty(n_samples, dtype=np.float32)
+    conf = np.empty(n_samples, dtype=np.float32)
+    
+    for j in prange(n_samples):
+        if mode == 2:  # Hard voting - fraction of models over the threshold
+            votes = 0
+            max_conf = confidences[0, j]
+            for m in range(n_models):
+                if scores[m, j] > threshold:
+                    votes += 1
+                if confidences[m, j] > max_conf:
+                    max_conf = confidences[m, j]
+            raw[j] = votes / n_models
+            conf[j] = max_conf
+        else:  # Soft voting - uniform or normalized weighted mean
+            s = 0.0
+            c = 0.0
+            for m in range(n_models):
+                w = weights[m] if mode == 1 else 1.0 / n_models
+                s += w * scores[m, j]
+                c += w * confidences[m, j]
+            raw[j] = s
+            conf[j] = c
+    
+    return raw, conf
+
+
+def _json_default(value: Any) -> Any:
+    """Encode NumPy values and timestamps that JSON has no native type for."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dump_metadata(metadata: Dict[str, Any], filepath: str) -> None:
+    """Write ensemble metadata as JSON."""
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(metadata, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        payload = json.dumps(metadata, default=_json_default).encode()
+    
+    with open(filepath, 'wb') as f:
+        f.write(payload)
+
+
+def _load_metadata(filepath: str) -> Dict[str, Any]:
+    """Read ensemble metadata written by _dump_metadata."""
+    with open(filepath, 'rb') as f:
+        payload = f.read()
+    
+    return orjson.loads(payload) if ORJSON_AVAILABLE else json.loads(payload)
+
+
+class _AnomalyMicroBatcher:
+    """Coalesce concurrent predict_anomalies calls into a single batched model pass."""
+    
+    def __init__(self, predict_batch, max_batch_size: int, max_batch_duration: float):
+        """Initialize batcher around an async ``predict_batch(features_list, include_individual)`` callable."""
+        self._predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_batch_duration = max_batch_duration
+        self._queue = None
+        self._worker = None
+        self._loop = None
+    
+    async def submit(
+        self,
+        features_list: List[Dict[str, Any]],
+        include_individual: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Queue a request and wait for its slice of the batched results."""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        
+        future = loop.create_future()
+        await self._queue.put((features_list, include_individual, future))
+        return await future
+    
+    async def _run(self) -> None:
+        """Drain queued requests into batches until the event loop stops."""
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._queue.get()]
+            batch_size = len(pending[0][0])
+            deadline = loop.time() + self.max_batch_duration
+            
+            # Wait up to max_batch_duration for more requests to share the pass
+            while batch_size < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                batch_size += len(item[0])
+            
+            await self._dispatch(pending)
+    
+    async def _dispatch(self, pending: List[Tuple[List[Dict[str, Any]], bool, asyncio.Future]]) -> None:
+        """Run one batch and scatter the results back to the waiting callers."""
+        combined = [features for features_list, _, _ in pending for features in features_list]
+        # Per-model scores are built for the whole batch if any caller asked for them
+        include_individual = any(include for _, include, _ in pending)
+        try:
+            results = await self._predict_batch(combined, include_individual)
+        except Exception as e:
+            if len(pending) == 1:
+                future = pending[0][2]
+                if not future.done():
+                    future.set_exception(e)
+                return
+            # Retry requests on their own so one bad request fails only its caller
+            for item in pending:
+                await self._dispatch([item])
+            return
+        
+        offset = 0
+        for features_list, _, future in pending:
+            if not future.done():
+                future.set_result(results[offset:offset + len(features_list)])
+            offset += len(features_list)
+
 
 class EnsembleModel:
     """Ensemble model combining multiple anomaly detection and morphing detection algorithms."""
@@ -44,30 +198,56 @@ class EnsembleModel:
         self.model_list = self.config.get('models', ['isolation_forest', 'ocsvm', 'autoencoder'])
         
         # Initialize calibrator for stable scoring
-        self.calibrator = AnomalyScoreCalibrator()
+        self.calibrator = AnomalyScoreCalibrator(
+            method=self.config.get('calibration_method', 'isotonic')
+        )
+        
+        # Optional micro-batching of concurrent predict_anomalies calls
+        batching = self.config.get('micro_batching', {}) or {}
+        self._batcher = _AnomalyMicroBatcher(
+            self._predict_anomalies_batch,
+            max_batch_size=batching.get('max_batch_size', 256),
+            max_batch_duration=batching.get('max_batch_duration_ms', 5) / 1000.0
+        ) if batching.get('enabled', False) else None
         
         # Initialize individual models
         self._initialize_models()
         
         # Performance tracking
         self.training_metrics = {}
-        self.prediction_cache = {}
+        
+        # LRU cache of combined anomaly results keyed by a digest of the whole request; Isolation
+        # Forest probabilities are normalized per batch, so rows are never mixed across requests
+        self.prediction_cache_size = self.config.get('prediction_cache_size', 0)
+        self.prediction_cache = OrderedDict()
+        
+        # Training column order, used to build request matrices without pandas inference
+        self._feature_order: Optional[List[str]] = None
         
     def _initialize_models(self):
         """Initialize individual anomaly detection models."""
         try:
+            # Models are predicted concurrently via asyncio.to_thread, so each
+            # predict must do its heavy lifting in GIL-releasing native code
+            n_jobs = self.config.get('n_jobs', -1)
+            
             # Initialize anomaly detection models
             if 'isolation_forest' in self.model_list:
-                self.anomaly_models['isolation_forest'] = IsolationForestModel()
+                self.anomaly_models['isolation_forest'] = IsolationForestModel(n_jobs=n_jobs)
                 
             if 'ocsvm' in self.model_list:
                 self.anomaly_models['ocsvm'] = OneClassSVMModel()
                 
             if 'autoencoder' in self.model_list and AUTOENCODER_AVAILABLE:
-                self.anomaly_models['autoencoder'] = AutoencoderModel()
+                self.anomaly_models['autoencoder'] = AutoencoderModel(
+                    intra_op_threads=max(1, (os.cpu_count() or 2) // 2)
+                )
             elif 'autoencoder' in self.model_list and not AUTOENCODER_AVAILABLE:
                 print("WARNING: Skipping autoencoder model - TensorFlow not available")
             
+            # Normalized weights in anomaly model order, built once instead of per call
+            self._build_weight_vector()
+            
             # Initialize morphing detection models
             self.morphing_models['entity_morphing'] = EntityMorphingDetector()
             self.morphing_models['behavioral_drift'] = BehavioralDriftDetector()
@@ -94,42 +274,47 @@ class EnsembleModel:
             start_time = datetime.now()
             training_results = {}
             
-            # Train anomaly detection models
-            for model_name, model in self.anomaly_models.items():
-                logger.info(f"Training {model_name}...")
-                try:
-                    model_metrics = model.train(
+            # Train anomaly detection models concurrently; they are independent and
+            # their fits run mostly in native code that releases the GIL
+            model_names = list(self.anomaly_models)
+            logger.info(f"Training {', '.join(model_names)}...")
+            self._warm_combine_kernel()
+            results = await asyncio.gather(
+                *(
+                    asyncio.to_thread(
+                        self.anomaly_models[model_name].train,
                         X=X,
                         y=y,
                         hyperparameter_tuning=hyperparameter_tuning,
                         cross_validation=cross_validation
                     )
-                    training_results[model_name] = model_metrics
-                    logger.info(f"{model_name} training completed successfully")
-                    
-                except Exception as e:
-                    logger.error(f"Failed to train {model_name}: {str(e)}")
-                    training_results[model_name] = {"error": str(e)}
+                    for model_name in model_names
+                ),
+                return_exceptions=True
+            )
             
             # Train morphing detection models
-            for model_name, model in self.morphing_models.items():
-                logger.info(f"Training {model_name}...")
-                try:
-                    model_metrics = await model.train(X=X, y=y)
-                    training_results[model_name] = model_metrics
+            morphing_names = list(self.morphing_models)
+            logger.info(f"Training {', '.join(morphing_names)}...")
+            results += await asyncio.gather(
+                *(self.morphing_models[model_name].train(X=X, y=y) for model_name in morphing_names),
+                return_exceptions=True
+            )
+            
+            for model_name, result in zip(model_names + morphing_names, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Failed to train {model_name}: {str(result)}")
+                    training_results[model_name] = {"error": str(result)}
+                else:
+                    training_results[model_name] = result
                     logger.info(f"{model_name} training completed successfully")
-                    
-                except Exception as e:
-                    logger.error(f"Failed to train {model_name}: {str(e)}")
-                    training_results[model_name] = {"error": str(e)}
             
             # CRITICAL: Calibrate ensemble scores for stable thresholds
             if X_val is not None:
                 logger.info("Calibrating ensemble scores...")
                 try:
                     # Get raw scores from validation set
-                    val_predictions = await self._get_raw_ensemble_scores(X_val)
-                    raw_scores = np.array([p['raw_score'] for p in val_predictions])
+                    raw_scores = await self._get_raw_ensemble_scores(X_val)
                     
                     # Fit calibrator
                     self.calibrator.fit(raw_scores, y_val)
@@ -143,6 +328,8 @@ class EnsembleModel:
             
             training_time = (datetime.now() - start_time).total_seconds()
             self.is_trained = True
+            self.prediction_cache.clear()
+            self._refresh_feature_order()
             
             # Calculate ensemble metrics
             successful_models = [name for name, result in training_results.items() 
@@ -171,67 +358,212 @@ class EnsembleModel:
             logger.error(f"Ensemble training failed: {str(e)}")
             raise
     
-    async def _get_raw_ensemble_scores(self, X: pd.DataFrame) -> List[Dict[str, Any]]:
-        """Get raw ensemble scores for calibration."""
-        model_predictions = {}
+    async def _predict_anomaly_models(self, X: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+        """Run all trained anomaly models on a batch concurrently in worker threads."""
+        model_names = [name for name, model in self.anomaly_models.items() if model.is_trained]
         
-        for model_name, model in self.anomaly_models.items():
-            if model.is_trained:
-                try:
-                    predictions = model.predict(X)
-                    model_predictions[model_name] = predictions
-                except Exception as e:
-                    logger.warning(f"Prediction failed for {model_name}: {str(e)}")
+        # Model inference is mostly native sklearn/NumPy code that releases the GIL
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self.anomaly_models[name].predict, X) for name in model_names),
+            return_exceptions=True
+        )
         
-        results = []
-        for i in range(len(X)):
-            scores = []
-            for model_name, predictions in model_predictions.items():
-                if i < len(predictions['scores']):
-                    scores.append(predictions['scores'][i])
-            
-            if scores:
-                raw_score = np.mean(scores) if self.weights == 'uniform' else np.average(
-                    scores, weights=self._get_model_weights(list(model_predictions.keys()))
-                )
+        model_predictions = {}
+        for model_name, predictions in zip(model_names, results):
+            if isinstance(predictions, Exception):
+                logger.warning(f"Prediction failed for {model_name}: {str(predictions)}")
             else:
-                raw_score = 0.0
-            
-            results.append({'raw_score': raw_score})
+                # Numeric outputs as contiguous float32 arrays; patterns and explanations stay lists
+                predictions['scores'] = np.asarray(predictions['scores'], dtype=np.float32)
+                predictions['confidence'] = np.asarray(predictions['confidence'], dtype=np.float32)
+                model_predictions[model_name] = predictions
         
-        return results
+        return model_predictions
+    
+    async def _get_raw_ensemble_scores(self, X: pd.DataFrame) -> np.ndarray:
+        """Get raw ensemble scores for calibration."""
+        model_predictions = await self._predict_anomaly_models(self._as_float32(X))
+        
+        # Models that did not score every row are left out of the average
+        model_names = [
+            name for name, predictions in model_predictions.items()
+            if len(predictions['scores']) == len(X)
+        ]
+        if not model_names:
+            return np.zeros(len(X), dtype=np.float64)
+        
+        # (models, samples) score matrix averaged in one pass
+        scores = np.stack([model_predictions[name]['scores'] for name in model_names]).astype(np.float64)
+        if self.weights == 'uniform':
+            return scores.mean(axis=0)
+        
+        return self._subset_weights(model_names) @ scores
     
-    async def predict_anomalies(self, features_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    async def predict_anomalies(
+        self,
+        features_list: List[Dict[str, Any]],
+        explain: bool = False,
+        include_individual: bool = False
+    ) -> List[Dict[str, Any]]:
         """Predict anomalies using ensemble of models."""
         if not self.is_trained:
             raise ValueError("Ensemble must be trained before making predictions")
         
+        results = await self._predict_cached(features_list, include_individual)
+        
+        for result in results:
+            # Cached or coalesced results may carry per-model scores another caller asked for
+            if not include_individual:
+                result.pop('individual_predictions', None)
+            # Summary strings are rendered only for callers that read them
+            if explain:
+                result['explanation'] = self._with_summary(result.get('explanation'))
+        
+        return results
+    
+    async def _predict_cached(
+        self,
+        features_list: List[Dict[str, Any]],
+        include_individual: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Score feature dicts, serving repeated requests from the prediction cache when enabled."""
+        if self.prediction_cache_size <= 0:
+            return await self._predict_uncached(features_list, include_individual)
+        
+        # Whole requests are cached: per-row caching would rescore misses as their own batch
+        # and change their batch-normalized scores depending on what else was cached.
+        # Entries cached without per-model scores are misses for callers that need them.
+        key = self._request_key(features_list)
+        cached = self.prediction_cache.get(key)
+        if cached is not None and include_individual and any(
+            'individual_predictions' not in result for result in cached
+        ):
+            cached = None
+        if cached is not None:
+            self.prediction_cache.move_to_end(key)
+            # Deep copies keep callers from mutating the cached explanations and patterns
+            return copy.deepcopy(cached)
+        
+        results = await self._predict_uncached(features_list, include_individual)
+        self.prediction_cache[key] = copy.deepcopy(results)
+        while len(self.prediction_cache) > self.prediction_cache_size:
+            self.prediction_cache.popitem(last=False)
+        
+        return results
+    
+    async def _predict_uncached(
+        self,
+        features_list: List[Dict[str, Any]],
+        include_individual: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Score feature dicts through the micro-batcher when enabled, otherwise directly."""
+        if self._batcher is not None:
+            return await self._batcher.submit(features_list, include_individual)
+        return await self._predict_anomalies_batch(features_list, include_individual)
+    
+    @staticmethod
+    def _request_key(features_list: List[Dict[str, Any]]) -> bytes:
+        """Content digest of a request's feature dicts, in order, independent of key order within each dict."""
+        payload = json.dumps(features_list, sort_keys=True, default=str).encode()
+        return hashlib.blake2b(payload, digest_size=16).digest()
+    
+    def _features_frame(self, features_list: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Build the model input frame, filling a float32 matrix directly when the schema matches training."""
+        feature_order = self._feature_order
+        if feature_order:
+            n_features = len(feature_order)
+            X = np.empty((len(features_list), n_features), dtype=np.float32)
+            try:
+                for i, features in enumerate(features_list):
+                    if len(features) != n_features:
+                        raise KeyError
+                    X[i] = [features[name] for name in feature_order]
+            except (KeyError, TypeError, ValueError):
+                # Extra, missing or non-numeric fields go through pandas as before
+                pass
+            else:
+                return pd.DataFrame(X, columns=feature_order, copy=False)
+        
+        return self._as_float32(pd.DataFrame(features_list))
+    
+    @staticmethod
+    def _as_float32(X: pd.DataFrame) -> pd.DataFrame:
+        """Downcast an all-numeric frame to float32, halving the bytes the models read."""
+        if all(pd.api.types.is_numeric_dtype(dtype) for dtype in X.dtypes):
+            return X.astype(np.float32, copy=False)
+        return X
+    
+    def _refresh_feature_order(self) -> None:
+        """Adopt the trained anomaly models' feature order when they all agree on it."""
+        orders = {
+            tuple(model.feature_names) for model in self.anomaly_models.values()
+            if model.is_trained and model.feature_names
+        }
+        self._feature_order = list(orders.pop()) if len(orders) == 1 else None
+    
+    async def _predict_anomalies_batch(
+        self,
+        features_list: List[Dict[str, Any]],
+        include_individual: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Run the anomaly models on a batch of feature dicts and combine their predictions."""
         try:
-            # Convert to DataFrame for batch processing
-            X = pd.DataFrame(features_list)
+            # Convert to a DataFrame for batch processing
+            X = self._features_frame(features_list)
             
             # Get predictions from all anomaly models
-            model_predictions = {}
-            
-            for model_name, model in self.anomaly_models.items():
-                if model.is_trained:
-                    try:
-                        predictions = model.predict(X)
-                        model_predictions[model_name] = predictions
-                    except Exception as e:
-                        logger.warning(f"Prediction failed for {model_name}: {str(e)}")
-            
-            # Combine predictions using ensemble strategy
-            ensemble_results = []
+            model_predictions = await self._predict_anomaly_models(X)
+            
+            # Only models with every output covering every row take part in the batch
+            # combination; validating here keeps the per-row packaging free of checks
+            n_samples = len(features_list)
+            for model_name in list(model_predictions):
+                predictions = model_predictions[model_name]
+                lengths = {
+                    len(predictions.get(key, ()))
+                    for key in ('scores', 'confidence', 'patterns', 'explanations')
+                }
+                if lengths != {n_samples}:
+                    logger.warning(f"Ignoring {model_name}: returned "
+                                   f"{len(predictions['scores'])} scores for {n_samples} samples")
+                    del model_predictions[model_name]
             
-            for i in range(len(features_list)):
-                result = await self._combine_anomaly_predictions(i, model_predictions)
-                ensemble_results.append(result)
+            if not model_predictions:
+                # No valid predictions
+                return [
+                    {'score': 0.0, 'confidence': 0.0, 'patterns': [], 'explanation': None}
+                    for _ in range(n_samples)
+                ]
+            
+            # Combine predictions for the whole batch using ensemble strategy
+            model_names = list(model_predictions)
+            scores = np.stack([model_predictions[name]['scores'] for name in model_names])
+            confidences = np.stack([model_predictions[name]['confidence'] for name in model_names])
+            raw_scores, ensemble_confidences = self._combine_score_matrix(model_names, scores, confidences)
+            
+            # CRITICAL: Apply calibration for stable, comparable scores (once per batch)
+            if self.calibrator.is_fitted:
+                ensemble_scores = self.calibrator.transform(raw_scores)
+            else:
+                ensemble_scores = raw_scores
+            
+            results = [
+                self._package_anomaly_result(i, model_predictions, ensemble_scores[i], ensemble_confidences[i])
+                for i in range(n_samples)
+            ]
+            
+            # Per-model scores straight from the (models, samples) matrices, only on request
+            if include_individual:
+                for i, result in enumerate(results):
+                    result['individual_predictions'] = {
+                        name: {'score': float(scores[k, i]), 'confidence': float(confidences[k, i])}
+                        for k, name in enumerate(model_names)
+                    }
             
-            return ensemble_results
+            return results
             
-        except Exception as e:
-            logger.error(f"Ensemble anomaly prediction failed: {str(e)}")
+        except Exception:
+            logger.exception("Ensemble anomaly prediction failed")
             raise
     
     async def predict_morphing(self, features_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -240,136 +572,142 @@ class EnsembleModel:
             raise ValueError("Ensemble must be trained before making predictions")
         
         try:
-            # Get predictions from morphing models
-            morphing_results = []
-            
-            for features in features_list:
-                # Entity morphing detection
-                entity_morphing_result = await self.morphing_models['entity_morphing'].predict(features)
-                
-                # Behavioral drift detection
-                drift_result = await self.morphing_models['behavioral_drift'].predict(features)
-                
-                # Combine morphing predictions
-                combined_result = self._combine_morphing_predictions(
-                    entity_morphing_result,
-                    drift_result
-                )
-                
-                morphing_results.append(combined_result)
+            # Get predictions from morphing models for the whole batch
+            entity_results, drift_results = await asyncio.gather(
+                self._predict_morphing_model('entity_morphing', features_list),
+                self._predict_morphing_model('behavioral_drift', features_list)
+            )
             
-            return morphing_results
+            # Combine morphing predictions
+            return self._combine_morphing_predictions(entity_results, drift_results)
             
         except Exception as e:
             logger.error(f"Ensemble morphing prediction failed: {str(e)}")
             raise
     
-    async def _combine_anomaly_predictions(
+    async def _predict_morphing_model(
         self,
-        index: int,
-        model_predictions: Dict[str, Dict[str, Any]]
-    ) -> Dict[str, Any]:
-        """Combine anomaly predictions from multiple models."""
-        try:
-            scores = []
-            confidences = []
-            all_patterns = []
-            explanations = {}
-            
-            # Extract predictions from each model
-            for model_name, predictions in model_predictions.items():
-                if index < len(predictions['scores']):
-                    scores.append(predictions['scores'][index])
-                    confidences.append(predictions['confidence'][index])
-                    all_patterns.extend(predictions['patterns'][index])
-                    
-                    if predictions['explanations'][index]:
-                        explanations[model_name] = predictions['explanations'][index]
-            
-            if not scores:
-                # No valid predictions
-                return {
-                    'score': 0.0,
-                    'confidence': 0.0,
-                    'patterns': [],
-                    'explanation': None
-                }
-            
-            # Combine scores using voting strategy
-            if self.voting_strategy == 'soft':
-                # Weighted average of raw scores
-                if self.weights == 'uniform':
-                    raw_score = np.mean(scores)
-                    ensemble_confidence = np.mean(confidences)
-                else:
-                    weights = self._get_model_weights(list(model_predictions.keys()))
-                    raw_score = np.average(scores, weights=weights)
-                    ensemble_confidence = np.average(confidences, weights=weights)
-            else:
-                # Hard voting - majority decision
-                threshold = model_config['thresholds']['anomaly_score']
-                anomaly_votes = sum(1 for score in scores if score > threshold)
-                raw_score = anomaly_votes / len(scores)
-                ensemble_confidence = max(confidences) if confidences else 0.0
-            
-            # CRITICAL: Apply calibration for stable, comparable scores
-            if self.calibrator.is_fitted:
-                ensemble_score = float(self.calibrator.transform(np.array([raw_score]))[0])
+        model_name: str,
+        features_list: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Predict a batch with one morphing model, natively batched when it supports it."""
+        model = self.morphing_models[model_name]
+        if hasattr(model, 'predict_batch'):
+            return await model.predict_batch(features_list)
+        return list(await asyncio.gather(*(model.predict(features) for features in features_list)))
+    
+    def _combine_score_matrix(
+        self,
+        model_names: List[str],
+        scores: np.ndarray,
+        confidences: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Combine (models, samples) score and confidence matrices into ensemble scores."""
+        # Large batches go through the compiled kernel when Numba is available
+        if NUMBA_AVAILABLE and scores.shape[1] >= JIT_MIN_BATCH_SIZE:
+            if self.voting_strategy != 'soft':
+                mode = _HARD
             else:
-                ensemble_score = float(raw_score)
-            
-            # Combine patterns (remove duplicates)
-            unique_patterns = list(set(all_patterns))
-            
-            # Create combined explanation
-            combined_explanation = self._create_combined_explanation(
-                explanations,
-                ensemble_score,
-                ensemble_confidence,
-                unique_patterns
+                mode = _SOFT_UNIFORM if self.weights == 'uniform' else _SOFT_WEIGHTED
+            return _combine_kernel(
+                np.ascontiguousarray(scores, dtype=np.float32),
+                np.ascontiguousarray(confidences, dtype=np.float32),
+                self._subset_weights(model_names),
+                mode,
+                float(model_config['thresholds']['anomaly_score'])
             )
-            
-            return {
-                'score': float(ensemble_score),
-                'confidence': float(ensemble_confidence),
-                'patterns': unique_patterns[:10],  # Limit to top 10 patterns
-                'explanation': combined_explanation,
-                'individual_predictions': {
-                    name: {
-                        'score': predictions['scores'][index],
-                        'confidence': predictions['confidence'][index]
-                    }
-                    for name, predictions in model_predictions.items()
-                    if index < len(predictions['scores'])
-                }
-            }
-            
-        except Exception as e:
-            logger.error(f"Failed to combine anomaly predictions: {str(e)}")
-            return {
-                'score': 0.0,
-                'confidence': 0.0,
-                'patterns': ['ensemble_error'],
-                'explanation': {'error': str(e)}
-            }
+        
+        if self.voting_strategy == 'soft':
+            # Weighted average of raw scores
+            if self.weights == 'uniform':
+                return scores.mean(axis=0), confidences.mean(axis=0)
+            weights = self._subset_weights(model_names)
+            return (
+                np.average(scores, axis=0, weights=weights),
+                np.average(confidences, axis=0, weights=weights)
+            )
+        
+        # Hard voting - majority decision as the fraction of models over the threshold
+        threshold = model_config['thresholds']['anomaly_score']
+        votes = np.count_nonzero(scores > threshold, axis=0)
+        return votes.astype(np.float32) / scores.shape[0], confidences.max(axis=0)
     
-    def _combine_morphing_predictions(
+    def _package_anomaly_result(
         self,
-        entity_morphing_result: Dict[str, Any],
-        drift_result: Dict[str, Any]
+        index: int,
+        model_predictions: Dict[str, Dict[str, Any]],
+        ensemble_score: float,
+        ensemble_confidence: float
     ) -> Dict[str, Any]:
-        """Combine morphing predictions from different models."""
+        """Build the ensemble result for one sample from its combined scores."""
+        # Inputs are validated once per batch, so this per-row path has no try/except
+        # Combine patterns in first-seen order without duplicates, keeping the top 10
+        seen_patterns = {}
+        explanations = {}
+        
+        # Collect patterns and explanations from each model
+        for model_name, predictions in model_predictions.items():
+            for pattern in predictions['patterns'][index]:
+                if len(seen_patterns) >= 10:
+                    break
+                seen_patterns.setdefault(pattern, None)
+            
+            if predictions['explanations'][index]:
+                explanations[model_name] = predictions['explanations'][index]
+        
+        ensemble_score = float(ensemble_score)
+        
+        unique_patterns = list(seen_patterns)
+        
+        # Create combined explanation
+        combined_explanation = self._create_combined_explanation(
+            explanations,
+            ensemble_score,
+            ensemble_confidence,
+            unique_patterns
+        )
+        
+        return {
+            'score': float(ensemble_score),
+            'confidence': float(ensemble_confidence),
+            'patterns': unique_patterns,
+            'explanation': combined_explanation
+        }
+    
+    def _combine_morphing_predictions(
+        self,
+        entity_results: List[Dict[str, Any]],
+        drift_results: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Combine batched morphing predictions from different models."""
         try:
+            def column(results, key):
+                return np.asarray([result.get(key, 0.0) for result in results], dtype=np.float32)
+            
             # Weighted combination of morphing scores
-            morphing_score = (entity_morphing_result.get('score', 0.0) * 0.6 + 
-                            drift_result.get('score', 0.0) * 0.4)
+            morphing_scores = 0.6 * column(entity_results, 'score') + 0.4 * column(drift_results, 'score')
+            is_morphing = morphing_scores > model_config['thresholds']['morphing_score']
             
-            # Combined confidence
-            confidence = max(
-                entity_morphing_result.get('confidence', 0.0),
-                drift_result.get('confidence', 0.0)
-            )
+            # Combined confidence and drift score
+            confidences = np.maximum(column(entity_results, 'confidence'), column(drift_results, 'confidence'))
+            drift_scores = np.maximum(column(entity_results, 'drift'), column(drift_results, 'drift_score'))
             
+        except Exception as e:
+            logger.error(f"Failed to combine morphing predictions: {str(e)}")
+            return [
+                {
+                    'score': 0.0,
+                    'is_morphing': False,
+                    'type': None,
+                    'confidence': 0.0,
+                    'drift': 0.0,
+                    'explanation': {'error': str(e)}
+                }
+                for _ in entity_results
+            ]
+        
+        results = []
+        for i, (entity_morphing_result, drift_result) in enumerate(zip(entity_results, drift_results)):
             # Determine morphing type
             morphing_type = None
             if entity_morphing_result.get('is_morphing', False):
@@ -377,34 +715,19 @@ class EnsembleModel:
             elif drift_result.get('is_drift', False):
                 morphing_type = 'behavioral_drift'
             
-            # Combined drift score
-            drift_score = max(
-                entity_morphing_result.get('drift', 0.0),
-                drift_result.get('drift_score', 0.0)
-            )
-            
-            return {
-                'score': float(morphing_score),
-                'is_morphing': morphing_score > model_config['thresholds']['morphing_score'],
+            results.append({
+                'score': float(morphing_scores[i]),
+                'is_morphing': bool(is_morphing[i]),
                 'type': morphing_type,
-                'confidence': float(confidence),
-                'drift': float(drift_score),
+                'confidence': float(confidences[i]),
+                'drift': float(drift_scores[i]),
                 'explanation': {
                     'entity_morphing': entity_morphing_result.get('explanation'),
                     'behavioral_drift': drift_result.get('explanation')
                 }
-            }
-            
-        except Exception as e:
-            logger.error(f"Failed to combine morphing predictions: {str(e)}")
-            return {
-                'score': 0.0,
-                'is_morphing': False,
-                'type': None,
-                'confidence': 0.0,
-                'drift': 0.0,
-                'explanation': {'error': str(e)}
-            }
+            })
+        
+        return results
     
     def _get_model_weights(self, model_names: List[str]) -> List[float]:
         """Get weights for model combination."""
@@ -415,6 +738,35 @@ class EnsembleModel:
         else:
             return [1.0 / len(model_names)] * len(model_names)
     
+    def _warm_combine_kernel(self) -> None:
+        """Compile the combination kernel up front so the first large batch does not pay for it.
+        
+        This also starts Numba's parallel runtime on the calling thread; the TBB layer
+        can hang at interpreter exit if it is first started from worker threads
+        launching kernels concurrently.
+        """
+        if NUMBA_AVAILABLE:
+            matrix = np.zeros((1, 1), dtype=np.float32)
+            _combine_kernel(matrix, matrix, np.ones(1, dtype=np.float32), _SOFT_UNIFORM, 0.5)
+    
+    def _build_weight_vector(self) -> None:
+        """Precompute the normalized weight vector over all anomaly models; rerun when weights change."""
+        self._anomaly_order = tuple(self.anomaly_models)
+        self._anomaly_index = {name: i for i, name in enumerate(self._anomaly_order)}
+        
+        weights = np.asarray(self._get_model_weights(list(self._anomaly_order)), dtype=np.float32)
+        if weights.sum() > 0:
+            weights /= weights.sum()
+        self._weights_vec = weights
+    
+    def _subset_weights(self, model_names: List[str]) -> np.ndarray:
+        """Normalized weights for the models that produced predictions, in the given order."""
+        if tuple(model_names) == self._anomaly_order:
+            return self._weights_vec
+        
+        weights = self._weights_vec[[self._anomaly_index[name] for name in model_names]]
+        return weights / weights.sum()
+    
     def _create_combined_explanation(
         self,
         explanations: Dict[str, Any],
@@ -423,69 +775,72 @@ class EnsembleModel:
         patterns: List[str]
     ) -> Dict[str, Any]:
         """Create combined explanation from individual model explanations."""
-        try:
-            # Determine severity
-            if ensemble_score > 0.8:
-                severity = "high"
-            elif ensemble_score > 0.6:
-                severity = "medium"
-            else:
-                severity = "low"
-            
-            # Create summary text
-            summary = f"Ensemble detected {severity} anomaly (score: {ensemble_score:.3f}, "
-            summary += f"confidence: {ensemble_confidence:.3f}). "
-            
-            if patterns:
-                summary += f"Key patterns: {', '.join(patterns[:5])}. "
-            
-            # Count model agreements
-            model_count = len(explanations)
-            summary += f"Based on {model_count} model(s)."
-            
-            return {
-                'ensemble_score': ensemble_score,
-                'ensemble_confidence': ensemble_confidence,
-                'severity': severity,
-                'summary': summary,
-                'patterns': patterns,
-                'individual_explanations': explanations,
-                'model_agreement': model_count
-            }
-            
-        except Exception as e:
-            logger.error(f"Failed to create combined explanation: {str(e)}")
-            return {
-                'ensemble_score': ensemble_score,
-                'summary': f"Ensemble anomaly detected (score: {ensemble_score:.3f})",
-                'error': str(e)
-            }
+        # Determine severity
+        if ensemble_score > 0.8:
+            severity = "high"
+        elif ensemble_score > 0.6:
+            severity = "medium"
+        else:
+            severity = "low"
+        
+        # The summary text is only rendered on request, see _with_summary
+        return {
+            'ensemble_score': ensemble_score,
+            'ensemble_confidence': ensemble_confidence,
+            'severity': severity,
+            'patterns': patterns,
+            'individual_explanations': explanations,
+            'model_agreement': len(explanations)
+        }
+    
+    @staticmethod
+    def _with_summary(explanation: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Copy of a combined explanation with its human-readable summary filled in."""
+        if not explanation or 'summary' in explanation or 'severity' not in explanation:
+            return explanation
+        
+        patterns = explanation['patterns']
+        key_patterns = f"Key patterns: {', '.join(patterns[:5])}. " if patterns else ""
+        summary = (
+            f"Ensemble detected {explanation['severity']} anomaly "
+            f"(score: {explanation['ensemble_score']:.3f}, "
+            f"confidence: {explanation['ensemble_confidence']:.3f}). "
+            f"{key_patterns}Based on {explanation['model_agreement']} model(s)."
+        )
+        
+        return {**explanation, 'summary': summary}
     
     async def load_models(self, model_directory: str = "models/") -> None:
         """Load pre-trained models from disk."""
         try:
-            # Load anomaly detection models
-            for model_name, model in self.anomaly_models.items():
-                model_path = f"{model_directory}{model_name}_model"
-                try:
-                    model.load_model(model_path)
-                    logger.info(f"Loaded {model_name} model")
-                except Exception as e:
-                    logger.warning(f"Could not load {model_name}: {str(e)}")
+            # Overlap disk reads and deserialization across models: blocking anomaly
+            # model loads run in worker threads, morphing loads are already async
+            model_names = list(self.anomaly_models) + list(self.morphing_models)
+            results = await asyncio.gather(
+                *(
+                    asyncio.to_thread(model.load_model, f"{model_directory}{model_name}_model")
+                    for model_name, model in self.anomaly_models.items()
+                ),
+                *(
+                    model.load_model(f"{model_directory}{model_name}_model")
+                    for model_name, model in self.morphing_models.items()
+                ),
+                return_exceptions=True
+            )
             
-            # Load morphing detection models
-            for model_name, model in self.morphing_models.items():
-                model_path = f"{model_directory}{model_name}_model"
-                try:
-                    await model.load_model(model_path)
+            for model_name, result in zip(model_names, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"Could not load {model_name}: {str(result)}")
+                else:
                     logger.info(f"Loaded {model_name} model")
-                except Exception as e:
-                    logger.warning(f"Could not load {model_name}: {str(e)}")
             
             # Check if any models are trained
             trained_anomaly_models = sum(1 for model in self.anomaly_models.values() if model.is_trained)
             trained_morphing_models = sum(1 for model in self.morphing_models.values() if hasattr(model, 'is_trained') and model.is_trained)
             
+            self.prediction_cache.clear()
+            self._refresh_feature_order()
+            self._warm_combine_kernel()
             if trained_anomaly_models > 0 or trained_morphing_models > 0:
                 self.is_trained = True
                 logger.info(f"Ensemble ready with {trained_anomaly_models} anomaly models and {trained_morphing_models} morphing models")
@@ -499,16 +854,20 @@ class EnsembleModel:
     def save_ensemble(self, filepath: str) -> None:
         """Save the entire ensemble to disk."""
         try:
-            # Save individual models
-            for model_name, model in self.anomaly_models.items():
-                if model.is_trained:
-                    model_path = f"{filepath}_{model_name}"
-                    model.save_model(model_path)
-            
-            for model_name, model in self.morphing_models.items():
-                if hasattr(model, 'is_trained') and model.is_trained:
-                    model_path = f"{filepath}_{model_name}"
-                    model.save_model(model_path)
+            # Save individual models in parallel; dumps are dominated by compression and disk writes
+            trained_models = [
+                (model_name, model)
+                for model_name, model in {**self.anomaly_models, **self.morphing_models}.items()
+                if getattr(model, 'is_trained', False)
+            ]
+            if trained_models:
+                with ThreadPoolExecutor(max_workers=len(trained_models)) as executor:
+                    futures = [
+                        executor.submit(model.save_model, f"{filepath}_{model_name}")
+                        for model_name, model in trained_models
+                    ]
+                    for future in futures:
+                        future.result()
             
             # Save ensemble metadata
             ensemble_metadata = {
@@ -521,7 +880,8 @@ class EnsembleModel:
                 'model_list': self.model_list
             }
             
-            joblib.dump(ensemble_metadata, f"{filepath}_ensemble_metadata.pkl")
+            # Plain JSON: the metadata holds no arrays, so pickling buys nothing
+            _dump_metadata(ensemble_metadata, f"{filepath}_ensemble_metadata.json")
             logger.info(f"Ensemble saved to {filepath}")
             
         except Exception as e:
@@ -531,8 +891,12 @@ class EnsembleModel:
     def load_ensemble(self, filepath: str) -> None:
         """Load the entire ensemble from disk."""
         try:
-            # Load ensemble metadata
-            ensemble_metadata = joblib.load(f"{filepath}_ensemble_metadata.pkl")
+            # Load ensemble metadata, falling back to the pickle written by older versions
+            metadata_path = f"{filepath}_ensemble_metadata.json"
+            if os.path.exists(metadata_path):
+                ensemble_metadata = _load_metadata(metadata_path)
+            else:
+                ensemble_metadata = joblib.load(f"{filepath}_ensemble_metadata.pkl")
             
             self.config = ensemble_metadata['config']
             self.model_version = ensemble_metadata['model_version']
@@ -540,6 +904,8 @@ class EnsembleModel:
             self.training_metrics = ensemble_metadata['training_metrics']
             self.voting_strategy = ensemble_metadata['voting_strategy']
             self.weights = ensemble_metadata['weights']
+            self._build_weight_vector()
+            self.prediction_cache.clear()
             self.model_list = ensemble_metadata['model_list']
             
             # Load individual models
@@ -549,6 +915,7 @@ class EnsembleModel:
                     model.load_model(model_path)
                 except Exception as e:
                     logger.warning(f"Could not load {model_name}: {str(e)}")
+            self._refresh_feature_order()
             
             logger.info(f"Ensemble loaded from {filepath}")
             
@@ -3,18 +3,171 @@
 import numpy as np
 import pandas as pd
 from typing import Dict, Any, List, Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import logging
+import time
+from dataclasses import dataclass
+from bisect import bisect_left
+from functools import lru_cache
+import warnings
 from collections import deque
 from sklearn.preprocessing import StandardScaler
-from sklearn.metrics.pairwise import euclidean_distances
 from scipy import stats
 import joblib
 
 from ...config import model_config
+from ...utils.jit import njit, prange, NUMBA_AVAILABLE, JIT_MIN_BATCH_SIZE
 
 logger = logging.getLogger(__name__)
 
+# Drift events kept per entity for frequency statistics
+_DRIFT_HISTORY_SIZE = 1000
+
+# Drift detectors in the order they run, and the drift type each one indicates
+_DRIFT_METHODS = ('statistical', 'distance_based', 'distribution_shift')
+_DRIFT_TYPES = ('statistical_drift', 'distribution_drift', 'distributional_drift')
+
+# Base confidence for combined scores above each cut (strictly greater than)
+_CONFIDENCE_CUTS = (0.4, 0.6, 0.8)
+_BASE_CONFIDENCE = (0.3, 0.5, 0.7, 0.9)
+
+# Reference rows the distance detector compares each window against; the mean
+# window-to-reference distance is already well estimated from a sample this size
+_DISTANCE_REFERENCE_ROWS = 256
+
+
+def _epoch_seconds(value: Any, default: float) -> float:
+    """Seconds since the epoch for a numeric, datetime or ISO-8601 timestamp (naive means UTC)."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return default
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return default
+
+
+# fastmath stays off: it assumes no NaNs and would drop the missing-value check
+@njit(parallel=True, fastmath=False, cache=True, nogil=True)
+def _window_moments_kernel(values):
+    """NaN-aware count, mean and sample std (Welford) of each column of a (rows, features) matrix."""
+    n_rows, n_features = values.shape
+    counts = np.zeros(n_features, dtype=np.int64)
+    means = np.full(n_features, np.nan)
+    stds = np.full(n_features, np.nan)
+    
+    for j in prange(n_features):
+        n = 0
+        mean = 0.0
+        m2 = 0.0
+        for i in range(n_rows):
+            x = values[i, j]
+            if x == x:  # Skip NaN
+                n += 1
+                delta = x - mean
+                mean += delta / n
+                m2 += delta * (x - mean)
+        counts[j] = n
+        if n > 0:
+            means[j] = mean
+        if n > 1:
+            stds[j] = np.sqrt(m2 / (n - 1))
+    
+    return counts, means, stds
+
+
+@njit(parallel=True, cache=True, nogil=True)
+def _ks_statistic_kernel(window_sorted, window_counts, reference_sorted, reference_counts):
+    """Two-sample KS statistic of each column pair by merging the sorted non-NaN prefixes."""
+    n_features = window_sorted.shape[1]
+    statistics = np.zeros(n_features)
+    
+    for j in prange(n_features):
+        n = window_counts[j]
+        m = reference_counts[j]
+        i = 0
+        k = 0
+        d = 0.0
+        while i < n and k < m:
+            x = min(window_sorted[i, j], reference_sorted[k, j])
+            while i < n and window_sorted[i, j] <= x:
+                i += 1
+            while k < m and reference_sorted[k, j] <= x:
+                k += 1
+            diff = abs(i / n - k / m)
+            if diff > d:
+                d = diff
+        statistics[j] = d
+    
+    return statistics
+
+
+class _EntityWindow:
+    """Fixed-size ring buffer of an entity's most recent observations."""
+    
+    __slots__ = ('features', 'buffer', 'timestamps', 'head', 'count')
+    
+    def __init__(self, window_size: int, features: List[str]):
+        """Preallocate storage for window_size observations of the given features."""
+        self.features = features
+        self.buffer = np.empty((window_size, len(self.features)), dtype=np.float32)
+        self.timestamps = np.empty(window_size, dtype=np.float64)  # Seconds since the epoch
+        self.head = 0
+        self.count = 0
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def append(self, values: Dict[str, float], timestamp: float):
+        """Write an observation over the oldest slot; missing features are stored as NaN."""
+        self.buffer[self.head] = [values.get(f, np.nan) for f in self.features]
+        self.timestamps[self.head] = timestamp
+        self.head = (self.head + 1) % len(self.buffer)
+        self.count = min(self.count + 1, len(self.buffer))
+    
+    def extend(self, rows: np.ndarray, timestamps: np.ndarray):
+        """Write a block of (observations, features) rows in arrival order."""
+        size = len(self.buffer)
+        if len(rows) >= size:
+            self.buffer[:] = rows[-size:]
+            self.timestamps[:] = timestamps[-size:]
+            self.head = 0
+            self.count = size
+            return
+        slots = (self.head + np.arange(len(rows))) % size
+        self.buffer[slots] = rows
+        self.timestamps[slots] = timestamps
+        self.head = (self.head + len(rows)) % size
+        self.count = min(self.count + len(rows), size)
+    
+    def values(self) -> np.ndarray:
+        """Observations in arrival order as a (count, features) array."""
+        if self.count < len(self.buffer):
+            return self.buffer[:self.count]
+        return np.concatenate((self.buffer[self.head:], self.buffer[:self.head]))
+
+
+@dataclass(slots=True)
+class _ReferenceArrays:
+    """A reference distribution's statistics and sample as arrays aligned with its feature list."""
+    
+    features: List[str]
+    mean: np.ndarray
+    std: np.ndarray
+    # Standardized distance subsample; the sample fields stay None without a stored sample
+    sample_center: Optional[np.ndarray] = None
+    sample_scale: Optional[np.ndarray] = None
+    sample_scaled: Optional[np.ndarray] = None
+    sample_sqnorm: Optional[np.ndarray] = None
+    # Column-sorted sample for KS tests; NaNs sort last after the valid prefix
+    sample_sorted: Optional[np.ndarray] = None
+    sample_counts: Optional[np.ndarray] = None
+
 
 class BehavioralDriftDetector:
     """Detector for identifying gradual behavioral drift in entities over time."""
@@ -25,6 +178,7 @@ class BehavioralDriftDetector:
         self.scaler = StandardScaler()
         self.is_trained = False
         self.model_version = None
+        self._rng = np.random.default_rng(model_config['global']['random_state'])  # Reference sampling
         
         # Configuration parameters
         self.window_size = self.config.get('window_size', 100)
@@ -34,6 +188,10 @@ class BehavioralDriftDetector:
         # Drift detection state
         self.entity_windows = {}  # Sliding windows for each entity
         self.reference_distributions = {}  # Reference distributions for comparison
+        self._reference_stats = {}  # Per-reference _ReferenceArrays
+        
+        # Memoized per-entity reference lookup, cleared whenever references change
+        self._entity_plan = lru_cache(maxsize=4096)(self._build_entity_plan)
         self.drift_statistics = {}  # Statistical measures for drift detection
         
         # Drift detection methods
@@ -88,12 +246,13 @@ class BehavioralDriftDetector:
         
         try:
             entity_id = features.get('entity_id', 'unknown')
+            now = time.time()  # One clock read shared by the window and drift statistics
             
             # Update entity window with new observation
-            self._update_entity_window(entity_id, features)
+            self._update_entity_window(entity_id, features, now)
             
             # Detect drift
-            drift_result = self._detect_drift(entity_id, features)
+            drift_result = self._detect_drift(entity_id, features, now)
             
             return drift_result
             
@@ -108,6 +267,97 @@ class BehavioralDriftDetector:
                 'explanation': {'error': str(e)}
             }
     
+    async def predict_batch(self, features_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Predict behavioral drift for a batch of observations, as if predicted one by one in order."""
+        if not self.is_trained:
+            raise ValueError("Model must be trained before making predictions")
+        
+        now = time.time()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(features_list)
+        
+        # Observations of one entity are scored together, in arrival order
+        groups: Dict[Any, List[int]] = {}
+        for i, features in enumerate(features_list):
+            groups.setdefault(features.get('entity_id', 'unknown'), []).append(i)
+        
+        for entity_id, indices in groups.items():
+            try:
+                entity_results = self._predict_entity_batch(
+                    entity_id, [features_list[i] for i in indices], now
+                )
+            except Exception as e:
+                logger.error(f"Batch prediction failed for entity {entity_id}: {str(e)}")
+                entity_results = [self._no_drift_result({'error': str(e)}) for _ in indices]
+            for i, result in zip(indices, entity_results):
+                results[i] = result
+        
+        return results
+    
+    def _predict_entity_batch(
+        self,
+        entity_id: str,
+        observations: List[Dict[str, Any]],
+        now: float
+    ) -> List[Dict[str, Any]]:
+        """Append an entity's observations to its window and score the window after each one."""
+        reference, reference_stats = self._entity_plan(entity_id)
+        window = self._entity_window(entity_id)
+        
+        # Window contents before the batch followed by the batch's own rows
+        prior = window.values().copy()
+        rows = np.array(
+            [
+                [
+                    obs[f] if isinstance(obs.get(f), (int, float)) else np.nan
+                    for f in window.features
+                ]
+                for obs in observations
+            ],
+            dtype=np.float32
+        ).reshape(len(observations), len(window.features))
+        window.extend(
+            rows,
+            np.array([_epoch_seconds(obs.get('timestamp'), now) for obs in observations], dtype=np.float64)
+        )
+        
+        if not reference:
+            return [
+                self._no_drift_result({'message': 'No reference distribution available'})
+                for _ in observations
+            ]
+        
+        history = np.concatenate((prior, rows))
+        
+        # Every history row's distances to the reference in one GEMM, shared by all
+        # the overlapping windows; used where the window observed every feature
+        history_distances = None
+        if reference_stats.sample_scaled is not None and len(history) >= self.min_samples:
+            history_distances = self._reference_distances(
+                history,
+                reference_stats.sample_center,
+                reference_stats.sample_scale,
+                reference_stats.sample_scaled,
+                reference_stats.sample_sqnorm
+            )
+        
+        results = []
+        for k in range(len(observations)):
+            end = len(prior) + k + 1
+            start = max(0, end - self.window_size)
+            if end - start < self.min_samples:
+                results.append(self._no_drift_result(
+                    {'message': f'Insufficient samples: {end - start}/{self.min_samples}'}
+                ))
+                continue
+            
+            window_arr = history[start:end]
+            distances = None
+            if history_distances is not None and not np.isnan(window_arr).all(axis=0).any():
+                distances = history_distances[start:end]
+            results.append(self._score_window(entity_id, window_arr, reference_stats, now, distances))
+        
+        return results
+    
     def _initialize_reference_distributions(self, X: pd.DataFrame):
         """Initialize reference distributions from training data."""
         try:
@@ -122,6 +372,7 @@ class BehavioralDriftDetector:
                 distribution = self._create_reference_distribution(X)
                 self.reference_distributions['general'] = distribution
             
+            self._cache_reference_stats()
             logger.info(f"Initialized {len(self.reference_distributions)} reference distributions")
             
         except Exception as e:
@@ -136,26 +387,35 @@ class BehavioralDriftDetector:
             if numeric_data.empty:
                 return {}
             
-            # Calculate statistical properties
-            distribution = {
-                'mean': numeric_data.mean().to_dict(),
-                'std': numeric_data.std().to_dict(),
-                'median': numeric_data.median().to_dict(),
-                'q25': numeric_data.quantile(0.25).to_dict(),
-                'q75': numeric_data.quantile(0.75).to_dict(),
-                'min': numeric_data.min().to_dict(),
-                'max': numeric_data.max().to_dict(),
-                'sample_count': len(data),
-                'feature_names': list(numeric_data.columns)
-            }
-            
-            # Calculate correlation matrix
-            if len(numeric_data.columns) > 1:
-                distribution['correlation_matrix'] = numeric_data.corr().to_dict()
+            # Calculate statistical properties over one contiguous buffer
+            feature_names = list(numeric_data.columns)
+            arr = numeric_data.to_numpy(dtype=np.float32)
+            with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+                # All-NaN columns and single-row stds yield NaN, as pandas does
+                warnings.simplefilter('ignore', RuntimeWarning)
+                q25, median, q75 = np.nanquantile(arr, [0.25, 0.5, 0.75], axis=0)
+                distribution = {
+                    'mean': dict(zip(feature_names, np.nanmean(arr, axis=0, dtype=np.float64).tolist())),
+                    'std': dict(zip(feature_names, np.nanstd(arr, axis=0, ddof=1, dtype=np.float64).tolist())),
+                    'median': dict(zip(feature_names, median.tolist())),
+                    'q25': dict(zip(feature_names, q25.tolist())),
+                    'q75': dict(zip(feature_names, q75.tolist())),
+                    'min': dict(zip(feature_names, np.nanmin(arr, axis=0).tolist())),
+                    'max': dict(zip(feature_names, np.nanmax(arr, axis=0).tolist())),
+                    'sample_count': len(data),
+                    'feature_names': feature_names
+                }
+                
+                # Correlation matrix, rows/columns ordered as feature_names
+                if len(feature_names) > 1:
+                    distribution['correlation_matrix'] = np.corrcoef(arr, rowvar=False)
             
-            # Store raw data for distribution comparison (limited size)
-            sample_size = min(len(numeric_data), 1000)  # Limit memory usage
-            distribution['sample_data'] = numeric_data.sample(n=sample_size).to_dict('records')
+            # Store raw data for distribution comparison (limited size), one column per feature
+            sample_size = min(len(arr), 1000)  # Limit memory usage
+            # Rows come back in random order, which the distance detector's prefix subsample relies on
+            sample_rows = self._rng.choice(len(arr), size=sample_size, replace=False)
+            distribution['sample_data'] = arr[sample_rows]
+            distribution['sample_columns'] = feature_names
             
             return distribution
             
@@ -163,388 +423,414 @@ class BehavioralDriftDetector:
             logger.error(f"Failed to create reference distribution: {str(e)}")
             return {}
     
+    @staticmethod
+    def _upgrade_reference_sample(reference: Dict[str, Any]):
+        """Convert a legacy list-of-records reference sample to an array plus columns."""
+        sample = reference.get('sample_data')
+        if isinstance(sample, list):
+            sample_df = pd.DataFrame(sample)
+            reference['sample_data'] = sample_df.to_numpy(dtype=np.float32, copy=True)
+            reference['sample_columns'] = list(sample_df.columns)
+    
+    def _cache_reference_stats(self):
+        """Cache each reference's statistics and sample as arrays aligned with its feature list."""
+        self._reference_stats = {}
+        self._entity_plan.cache_clear()
+        for reference_key, reference in self.reference_distributions.items():
+            reference_means = reference.get('mean', {})
+            reference_stds = reference.get('std', {})
+            features = list(reference.get('feature_names', reference_means))
+            mean = np.array([reference_means.get(f, np.nan) for f in features], dtype=np.float32)
+            std = np.array([reference_stds.get(f, np.nan) for f in features], dtype=np.float32)
+            reference_stats = _ReferenceArrays(features=features, mean=mean, std=std)
+            
+            sample = reference.get('sample_data')
+            if sample is not None and len(sample) > 0:
+                # Reorder the sample's columns to the feature list once, here
+                col_index = {c: i for i, c in enumerate(reference['sample_columns'])}
+                aligned = np.full((len(sample), len(features)), np.nan, dtype=np.float32)
+                present = [j for j, f in enumerate(features) if f in col_index]
+                aligned[:, present] = sample[:, [col_index[features[j]] for j in present]]
+                
+                # Standardize the sample once with the full-data statistics so the
+                # distance detector only has to scale the window at predict time
+                center = np.nan_to_num(mean, nan=0.0)
+                scale = std.copy()
+                scale[~(scale > 0)] = 1.0  # Zero-variance and undefined spreads stay unscaled
+                # The stored sample is in random order, so its prefix is a random subsample
+                sample_scaled = (np.nan_to_num(aligned[:_DISTANCE_REFERENCE_ROWS], nan=0.0) - center) / scale
+                reference_stats.sample_center = center
+                reference_stats.sample_scale = scale
+                reference_stats.sample_scaled = sample_scaled
+                reference_stats.sample_sqnorm = np.einsum('ij,ij->i', sample_scaled, sample_scaled)
+                reference_stats.sample_sorted = np.sort(aligned, axis=0)
+                reference_stats.sample_counts = np.count_nonzero(~np.isnan(aligned), axis=0)
+            
+            self._reference_stats[reference_key] = reference_stats
+    
+    def _build_entity_plan(self, entity_id: str) -> Tuple[Dict[str, Any], Optional[_ReferenceArrays]]:
+        """Reference distribution and cached reference arrays an entity is compared against."""
+        reference_key = entity_id if entity_id in self.reference_distributions else 'general'
+        return (
+            self.reference_distributions.get(reference_key, {}),
+            self._reference_stats.get(reference_key)
+        )
+    
+    def _new_entity_window(self, entity_id: str) -> _EntityWindow:
+        """Create an empty window holding the features of the entity's reference distribution."""
+        _, reference_stats = self._entity_plan(entity_id)
+        return _EntityWindow(self.window_size, reference_stats.features if reference_stats else [])
+    
     def _initialize_entity_windows(self, X: pd.DataFrame):
         """Initialize sliding windows for entities."""
         try:
             if 'entity_id' in X.columns:
                 for entity_id in X['entity_id'].unique():
-                    self.entity_windows[entity_id] = deque(maxlen=self.window_size)
+                    self.entity_windows[entity_id] = self._new_entity_window(entity_id)
             else:
-                self.entity_windows['general'] = deque(maxlen=self.window_size)
+                self.entity_windows['general'] = self._new_entity_window('general')
             
             logger.info(f"Initialized {len(self.entity_windows)} entity windows")
             
         except Exception as e:
             logger.error(f"Failed to initialize entity windows: {str(e)}")
     
+    @staticmethod
+    def _new_drift_statistics() -> Dict[str, Any]:
+        """Empty drift statistics for an entity."""
+        return {
+            'drift_history': deque(maxlen=_DRIFT_HISTORY_SIZE),
+            'false_positive_rate': 0.0,
+            'sensitivity': 1.0,
+            'last_drift_time': None,
+            'drift_frequency': 0.0,
+            'drift_count': 0,  # Drift events currently in drift_history
+            'first_event_time': None  # Epoch seconds of the oldest event in drift_history
+        }
+    
     def _calculate_baseline_statistics(self, X: pd.DataFrame):
         """Calculate baseline drift statistics."""
         try:
             for entity_id in self.entity_windows.keys():
-                self.drift_statistics[entity_id] = {
-                    'drift_history': [],
-                    'false_positive_rate': 0.0,
-                    'sensitivity': 1.0,
-                    'last_drift_time': None,
-                    'drift_frequency': 0.0
-                }
+                self.drift_statistics[entity_id] = self._new_drift_statistics()
             
             logger.info(f"Initialized drift statistics for {len(self.drift_statistics)} entities")
             
         except Exception as e:
             logger.error(f"Failed to calculate baseline statistics: {str(e)}")
     
-    def _update_entity_window(self, entity_id: str, features: Dict[str, Any]):
+    def _entity_window(self, entity_id: str) -> _EntityWindow:
+        """Window for an entity, created on first sight or rebuilt when its layout is stale."""
+        # Initialize window if not exists
+        if entity_id not in self.entity_windows:
+            self.entity_windows[entity_id] = self._new_entity_window(entity_id)
+            self.drift_statistics[entity_id] = self._new_drift_statistics()
+        
+        # Windows share their reference's feature list; one built against an
+        # earlier training run has a stale column layout and starts over
+        _, reference_stats = self._entity_plan(entity_id)
+        if reference_stats and self.entity_windows[entity_id].features is not reference_stats.features:
+            self.entity_windows[entity_id] = self._new_entity_window(entity_id)
+        
+        return self.entity_windows[entity_id]
+    
+    def _update_entity_window(self, entity_id: str, features: Dict[str, Any], now: float):
         """Update sliding window for entity with new observation."""
-        try:
-            # Initialize window if not exists
-            if entity_id not in self.entity_windows:
-                self.entity_windows[entity_id] = deque(maxlen=self.window_size)
-                self.drift_statistics[entity_id] = {
-                    'drift_history': [],
-                    'false_positive_rate': 0.0,
-                    'sensitivity': 1.0,
-                    'last_drift_time': None,
-                    'drift_frequency': 0.0
-                }
-            
-            # Add new observation to window
-            observation = {
-                'timestamp': features.get('timestamp', datetime.utcnow().isoformat()),
-                'features': {k: v for k, v in features.items() if isinstance(v, (int, float))}
-            }
-            
-            self.entity_windows[entity_id].append(observation)
-            
-        except Exception as e:
-            logger.error(f"Failed to update entity window: {str(e)}")
+        # Add new observation to window
+        self._entity_window(entity_id).append(
+            {k: v for k, v in features.items() if isinstance(v, (int, float))},
+            _epoch_seconds(features.get('timestamp'), now)
+        )
     
-    def _detect_drift(self, entity_id: str, current_features: Dict[str, Any]) -> Dict[str, Any]:
+    def _detect_drift(self, entity_id: str, current_features: Dict[str, Any], now: float) -> Dict[str, Any]:
         """Detect behavioral drift for an entity."""
-        try:
-            # Get reference distribution (use general if entity-specific not available)
-            reference = self.reference_distributions.get(entity_id, 
-                                                       self.reference_distributions.get('general', {}))
-            
-            if not reference:
-                return {
-                    'score': 0.0,
-                    'is_drift': False,
-                    'confidence': 0.0,
-                    'drift_type': None,
-                    'drift_score': 0.0,
-                    'explanation': {'message': 'No reference distribution available'}
-                }
-            
-            # Get entity window
-            window = self.entity_windows.get(entity_id, deque())
-            
-            if len(window) < self.min_samples:
-                return {
-                    'score': 0.0,
-                    'is_drift': False,
-                    'confidence': 0.0,
-                    'drift_type': None,
-                    'drift_score': 0.0,
-                    'explanation': {'message': f'Insufficient samples: {len(window)}/{self.min_samples}'}
-                }
-            
-            # Apply different drift detection methods
-            drift_results = {}
-            
-            # Statistical drift detection
-            drift_results['statistical'] = self._statistical_drift_detection(window, reference)
-            
-            # Distance-based drift detection
-            drift_results['distance_based'] = self._distance_based_drift_detection(window, reference)
-            
-            # Distribution shift detection
-            drift_results['distribution_shift'] = self._distribution_shift_detection(window, reference)
-            
-            # Combine results
-            combined_result = self._combine_drift_results(drift_results, entity_id)
-            
-            # Update drift statistics
-            self._update_drift_statistics(entity_id, combined_result)
-            
-            return combined_result
-            
-        except Exception as e:
-            logger.error(f"Failed to detect drift: {str(e)}")
-            return {
-                'score': 0.0,
-                'is_drift': False,
-                'confidence': 0.0,
-                'drift_type': None,
-                'drift_score': 0.0,
-                'explanation': {'error': str(e)}
-            }
+        # Get reference distribution (use general if entity-specific not available)
+        reference, reference_stats = self._entity_plan(entity_id)
+        
+        if not reference:
+            return self._no_drift_result({'message': 'No reference distribution available'})
+        
+        # Get entity window
+        window = self.entity_windows.get(entity_id)
+        
+        if window is None or len(window) < self.min_samples:
+            return self._no_drift_result(
+                {'message': f'Insufficient samples: {len(window or ())}/{self.min_samples}'}
+            )
+        
+        # Materialize the window once and share it between the detectors
+        return self._score_window(entity_id, window.values(), reference_stats, now)
     
-    def _statistical_drift_detection(self, window: deque, reference: Dict[str, Any]) -> Dict[str, Any]:
+    @staticmethod
+    def _no_drift_result(explanation: Dict[str, Any]) -> Dict[str, Any]:
+        """Result for an observation that could not be scored."""
+        return {
+            'score': 0.0,
+            'is_drift': False,
+            'confidence': 0.0,
+            'drift_type': None,
+            'drift_score': 0.0,
+            'explanation': explanation
+        }
+    
+    def _score_window(
+        self,
+        entity_id: str,
+        window_arr: np.ndarray,
+        reference_stats: _ReferenceArrays,
+        now: float,
+        distances: Optional[np.ndarray] = None
+    ) -> Dict[str, Any]:
+        """Run the drift detectors on a materialized window and record the combined result."""
+        # Apply different drift detection methods
+        drift_results = {}
+        
+        # Statistical drift detection
+        drift_results['statistical'] = self._statistical_drift_detection(window_arr, reference_stats)
+        
+        # Distance-based drift detection (window-to-reference distances may be precomputed)
+        if distances is None:
+            drift_results['distance_based'] = self._distance_based_drift_detection(window_arr, reference_stats)
+        else:
+            drift_results['distance_based'] = self._distance_result(distances)
+        
+        # Distribution shift detection
+        drift_results['distribution_shift'] = self._distribution_shift_detection(window_arr, reference_stats)
+        
+        # Combine results
+        combined_result = self._combine_drift_results(drift_results, entity_id)
+        
+        # Update drift statistics
+        self._update_drift_statistics(entity_id, combined_result, now)
+        
+        return combined_result
+    
+    @staticmethod
+    def _window_moments(window_arr: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Per-feature observation counts, means and sample stds ignoring NaN."""
+        if NUMBA_AVAILABLE and window_arr.size >= JIT_MIN_BATCH_SIZE:
+            return _window_moments_kernel(np.ascontiguousarray(window_arr))
+        
+        counts = np.count_nonzero(~np.isnan(window_arr), axis=0)
+        with warnings.catch_warnings(), np.errstate(divide='ignore', invalid='ignore'):
+            warnings.simplefilter('ignore', RuntimeWarning)  # Empty or single-value columns
+            means = np.nanmean(window_arr, axis=0, dtype=np.float64)
+            stds = np.nanstd(window_arr, axis=0, ddof=1, dtype=np.float64)
+        return counts, means, stds
+    
+    def _statistical_drift_detection(self, window_arr: np.ndarray, reference_stats: _ReferenceArrays) -> Dict[str, Any]:
         """Detect drift using statistical tests."""
-        try:
-            # Extract features from window
-            window_data = []
-            for obs in window:
-                window_data.append(obs['features'])
-            
-            if not window_data:
-                return {'score': 0.0, 'p_values': {}, 'significant_features': []}
-            
-            window_df = pd.DataFrame(window_data)
-            reference_means = reference.get('mean', {})
-            reference_stds = reference.get('std', {})
-            
-            drift_scores = []
-            p_values = {}
-            significant_features = []
-            
-            # Perform statistical tests for each feature
-            for feature in window_df.columns:
-                if feature in reference_means and feature in reference_stds:
-                    ref_mean = reference_means[feature]
-                    ref_std = reference_stds[feature]
-                    
-                    if ref_std > 0:
-                        # One-sample t-test
-                        window_values = window_df[feature].dropna()
-                        if len(window_values) > 1:
-                            t_stat, p_value = stats.ttest_1samp(window_values, ref_mean)
-                            p_values[feature] = p_value
-                            
-                            # Calculate drift score based on effect size
-                            effect_size = abs(window_values.mean() - ref_mean) / ref_std
-                            drift_scores.append(effect_size)
-                            
-                            # Check significance
-                            if p_value < 0.05:  # Significant at 5% level
-                                significant_features.append(feature)
-            
-            overall_score = np.mean(drift_scores) if drift_scores else 0.0
-            
-            return {
-                'score': float(min(overall_score, 1.0)),  # Cap at 1.0
-                'p_values': p_values,
-                'significant_features': significant_features
-            }
-            
-        except Exception as e:
-            logger.error(f"Statistical drift detection failed: {str(e)}")
+        if len(window_arr) == 0:
+            return {'score': 0.0, 'p_values': {}, 'significant_features': []}
+        
+        # Window columns are the reference's features, NaN where unobserved
+        counts, sample_means, sample_stds = self._window_moments(window_arr)
+        
+        # One-sample t-tests for all features at once; features need two
+        # observations and a usable reference spread
+        tested = np.flatnonzero((counts > 1) & (reference_stats.std > 0))
+        if not len(tested):
             return {'score': 0.0, 'p_values': {}, 'significant_features': []}
+        
+        counts = counts[tested]
+        sample_means = sample_means[tested]
+        sample_stds = sample_stds[tested]
+        ref_mean = reference_stats.mean[tested]
+        ref_std = reference_stats.std[tested]
+        features = [reference_stats.features[i] for i in tested]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_stats = (sample_means - ref_mean) / (sample_stds / np.sqrt(counts))
+        p_values = 2 * stats.t.sf(np.abs(t_stats), df=counts - 1)
+        
+        # Drift score based on effect size
+        effect_sizes = np.abs(sample_means - ref_mean) / ref_std
+        overall_score = effect_sizes.mean()
+        
+        return {
+            'score': float(min(overall_score, 1.0)),  # Cap at 1.0
+            'p_values': dict(zip(features, p_values)),
+            # Significant at 5% level
+            'significant_features': [features[i] for i in np.flatnonzero(p_values < 0.05)]
+        }
     
-    def _distance_based_drift_detection(self, window: deque, reference: Dict[str, Any]) -> Dict[str, Any]:
+    def _distance_based_drift_detection(self, window_arr: np.ndarray, reference_stats: _ReferenceArrays) -> Dict[str, Any]:
         """Detect drift using distance-based methods."""
-        try:
-            # Extract features from window
-            window_data = []
-            for obs in window:
-                window_data.append(obs['features'])
-            
-            if not window_data:
-                return {'score': 0.0, 'distances': []}
-            
-            window_df = pd.DataFrame(window_data)
-            reference_sample = reference.get('sample_data', [])
-            
-            if not reference_sample:
-                return {'score': 0.0, 'distances': []}
-            
-            reference_df = pd.DataFrame(reference_sample)
-            
-            # Align features
-            common_features = list(set(window_df.columns) & set(reference_df.columns))
-            if not common_features:
-                return {'score': 0.0, 'distances': []}
-            
-            window_aligned = window_df[common_features].fillna(0)
-            reference_aligned = reference_df[common_features].fillna(0)
-            
-            # Calculate distances
-            if len(window_aligned) > 0 and len(reference_aligned) > 0:
-                # Scale features
-                all_data = pd.concat([window_aligned, reference_aligned])
-                scaler = StandardScaler()
-                scaled_data = scaler.fit_transform(all_data)
-                
-                window_scaled = scaled_data[:len(window_aligned)]
-                reference_scaled = scaled_data[len(window_aligned):]
-                
-                # Calculate mean distance from window to reference
-                distances = euclidean_distances(window_scaled, reference_scaled)
-                mean_distance = np.mean(distances)
-                
-                # Normalize distance to [0, 1] range
-                # Use heuristic: distance > 2 standard deviations is considered high drift
-                normalized_score = min(mean_distance / 2.0, 1.0)
-                
-                return {
-                    'score': float(normalized_score),
-                    'mean_distance': float(mean_distance),
-                    'distances': distances.flatten().tolist()[:100]  # Limit size
-                }
-            
+        reference_scaled = reference_stats.sample_scaled
+        
+        if len(window_arr) == 0 or reference_scaled is None or len(reference_scaled) == 0:
             return {'score': 0.0, 'distances': []}
-            
-        except Exception as e:
-            logger.error(f"Distance-based drift detection failed: {str(e)}")
+        
+        # Compare on the features observed in the window; usually all of them
+        observed = ~np.isnan(window_arr).all(axis=0)
+        if not observed.any():
             return {'score': 0.0, 'distances': []}
+        
+        center = reference_stats.sample_center
+        scale = reference_stats.sample_scale
+        reference_sqnorm = reference_stats.sample_sqnorm
+        if not observed.all():
+            positions = np.flatnonzero(observed)
+            window_arr = window_arr[:, positions]
+            center = center[positions]
+            scale = scale[positions]
+            reference_scaled = reference_scaled[:, positions]
+            reference_sqnorm = np.einsum('ij,ij->i', reference_scaled, reference_scaled)
+        
+        return self._distance_result(
+            self._reference_distances(window_arr, center, scale, reference_scaled, reference_sqnorm)
+        )
+    
+    @staticmethod
+    def _reference_distances(
+        rows: np.ndarray,
+        center: np.ndarray,
+        scale: np.ndarray,
+        reference_scaled: np.ndarray,
+        reference_sqnorm: np.ndarray
+    ) -> np.ndarray:
+        """(rows, reference) Euclidean distances after scaling rows with the reference statistics."""
+        # Scale the rows with the reference's training-time statistics
+        rows_scaled = (np.nan_to_num(rows, nan=0.0) - center) / scale
+        
+        # All distances from one GEMM: ||x - y||^2 = ||x||^2 + ||y||^2 - 2 x.y
+        rows_sqnorm = np.einsum('ij,ij->i', rows_scaled, rows_scaled)
+        sq_distances = rows_sqnorm[:, None] + reference_sqnorm[None, :]
+        sq_distances -= 2.0 * (rows_scaled @ reference_scaled.T)
+        return np.sqrt(np.maximum(sq_distances, 0.0))
+    
+    @staticmethod
+    def _distance_result(distances: np.ndarray) -> Dict[str, Any]:
+        """Distance-based drift result from a window's (window, reference) distance matrix."""
+        mean_distance = np.mean(distances)
+        
+        # Normalize distance to [0, 1] range
+        # Use heuristic: distance > 2 standard deviations is considered high drift
+        normalized_score = min(mean_distance / 2.0, 1.0)
+        
+        return {
+            'score': float(normalized_score),
+            'mean_distance': float(mean_distance),
+            'distances': distances.ravel()[:100].tolist()  # Limit size
+        }
     
-    def _distribution_shift_detection(self, window: deque, reference: Dict[str, Any]) -> Dict[str, Any]:
+    def _distribution_shift_detection(self, window_arr: np.ndarray, reference_stats: _ReferenceArrays) -> Dict[str, Any]:
         """Detect drift using distribution shift methods."""
-        try:
-            # Extract features from window
-            window_data = []
-            for obs in window:
-                window_data.append(obs['features'])
-            
-            if not window_data:
-                return {'score': 0.0, 'ks_statistics': {}}
-            
-            window_df = pd.DataFrame(window_data)
-            reference_sample = reference.get('sample_data', [])
-            
-            if not reference_sample:
-                return {'score': 0.0, 'ks_statistics': {}}
-            
-            reference_df = pd.DataFrame(reference_sample)
-            
-            # Align features
-            common_features = list(set(window_df.columns) & set(reference_df.columns))
-            if not common_features:
-                return {'score': 0.0, 'ks_statistics': {}}
-            
-            ks_statistics = {}
-            drift_scores = []
-            
-            # Perform Kolmogorov-Smirnov test for each feature
-            for feature in common_features:
-                window_values = window_df[feature].dropna()
-                reference_values = reference_df[feature].dropna()
-                
-                if len(window_values) > 10 and len(reference_values) > 10:
-                    ks_stat, p_value = stats.ks_2samp(window_values, reference_values)
-                    ks_statistics[feature] = {
-                        'statistic': float(ks_stat),
-                        'p_value': float(p_value)
-                    }
-                    
-                    # Use KS statistic as drift score
-                    drift_scores.append(ks_stat)
-            
-            overall_score = np.mean(drift_scores) if drift_scores else 0.0
-            
-            return {
-                'score': float(overall_score),
-                'ks_statistics': ks_statistics
-            }
-            
-        except Exception as e:
-            logger.error(f"Distribution shift detection failed: {str(e)}")
+        reference_sorted = reference_stats.sample_sorted
+        
+        if len(window_arr) == 0 or reference_sorted is None or len(reference_sorted) == 0:
+            return {'score': 0.0, 'ks_statistics': {}}
+        
+        # Sort every window column once; NaNs sort last so each column's valid values are a prefix
+        window_counts = np.count_nonzero(~np.isnan(window_arr), axis=0)
+        reference_counts = reference_stats.sample_counts
+        tested = np.flatnonzero((window_counts > 10) & (reference_counts > 10))
+        if not len(tested):
             return {'score': 0.0, 'ks_statistics': {}}
+        
+        window_counts = window_counts[tested]
+        reference_counts = reference_counts[tested]
+        window_sorted = np.sort(window_arr[:, tested], axis=0)
+        reference_sorted = reference_sorted[:, tested]
+        
+        # Kolmogorov-Smirnov statistics for all features at once
+        if NUMBA_AVAILABLE:
+            ks_stats = _ks_statistic_kernel(
+                window_sorted, window_counts, reference_sorted, reference_counts
+            )
+        else:
+            ks_stats = np.empty(len(tested))
+            for j, (n, m) in enumerate(zip(window_counts, reference_counts)):
+                w = window_sorted[:n, j]
+                r = reference_sorted[:m, j]
+                grid = np.concatenate([w, r])
+                ks_stats[j] = np.max(np.abs(
+                    np.searchsorted(w, grid, side='right') / n
+                    - np.searchsorted(r, grid, side='right') / m
+                ))
+        
+        # Asymptotic two-sided p-values (scipy's ks_2samp 'asymp' mode)
+        effective_n = np.round(window_counts * reference_counts / (window_counts + reference_counts))
+        p_values = np.clip(stats.kstwo.sf(ks_stats, effective_n), 0.0, 1.0)
+        
+        ks_statistics = {
+            reference_stats.features[t]: {'statistic': float(d), 'p_value': float(p)}
+            for t, d, p in zip(tested, ks_stats, p_values)
+        }
+        
+        # Use KS statistic as drift score
+        overall_score = np.mean(ks_stats)
+        
+        return {
+            'score': float(overall_score),
+            'ks_statistics': ks_statistics
+        }
     
     def _combine_drift_results(self, drift_results: Dict[str, Dict[str, Any]], entity_id: str) -> Dict[str, Any]:
         """Combine results from different drift detection methods."""
-        try:
-            # Extract scores from each method
-            scores = []
-            for method, result in drift_results.items():
-                if 'score' in result:
-                    scores.append(result['score'])
-            
-            if not scores:
-                combined_score = 0.0
+        # Extract scores from each method
+        scores = []
+        for method, result in drift_results.items():
+            if 'score' in result:
+                scores.append(result['score'])
+        
+        if not scores:
+            combined_score = 0.0
+        else:
+            # Weighted average (can be configured)
+            weights = [0.4, 0.3, 0.3]  # statistical, distance, distribution
+            if len(scores) == len(weights):
+                combined_score = np.average(scores, weights=weights)
             else:
-                # Weighted average (can be configured)
-                weights = [0.4, 0.3, 0.3]  # statistical, distance, distribution
-                if len(scores) == len(weights):
-                    combined_score = np.average(scores, weights=weights)
-                else:
-                    combined_score = np.mean(scores)
-            
-            # Determine if drift is detected
-            is_drift = combined_score > self.drift_threshold
-            
-            # Calculate confidence
-            confidence = self._calculate_drift_confidence(combined_score, scores)
-            
-            # Determine drift type
-            drift_type = self._determine_drift_type(drift_results)
-            
-            # Generate explanation
-            explanation = self._generate_drift_explanation(drift_results, combined_score, is_drift)
-            
-            return {
-                'score': float(combined_score),
-                'is_drift': is_drift,
-                'confidence': float(confidence),
-                'drift_type': drift_type,
-                'drift_score': float(combined_score),
-                'explanation': explanation,
-                'individual_results': drift_results
-            }
-            
-        except Exception as e:
-            logger.error(f"Failed to combine drift results: {str(e)}")
-            return {
-                'score': 0.0,
-                'is_drift': False,
-                'confidence': 0.0,
-                'drift_type': None,
-                'drift_score': 0.0,
-                'explanation': {'error': str(e)}
-            }
+                combined_score = np.mean(scores)
+        
+        # Determine if drift is detected
+        is_drift = combined_score > self.drift_threshold
+        
+        # Calculate confidence
+        confidence = self._calculate_drift_confidence(combined_score, scores)
+        
+        # Determine drift type
+        drift_type = self._determine_drift_type(drift_results)
+        
+        # Generate explanation
+        explanation = self._generate_drift_explanation(drift_results, combined_score, is_drift)
+        
+        return {
+            'score': float(combined_score),
+            'is_drift': is_drift,
+            'confidence': float(confidence),
+            'drift_type': drift_type,
+            'drift_score': float(combined_score),
+            'explanation': explanation,
+            'individual_results': drift_results
+        }
     
     def _calculate_drift_confidence(self, combined_score: float, individual_scores: List[float]) -> float:
         """Calculate confidence in drift detection."""
-        try:
-            # Higher score and lower variance = higher confidence
-            if combined_score > 0.8:
-                base_confidence = 0.9
-            elif combined_score > 0.6:
-                base_confidence = 0.7
-            elif combined_score > 0.4:
-                base_confidence = 0.5
-            else:
-                base_confidence = 0.3
-            
-            # Adjust based on agreement between methods
-            if len(individual_scores) > 1:
-                score_variance = np.var(individual_scores)
-                # Lower variance = higher confidence
-                variance_adjustment = max(0, 0.2 - score_variance)
-                base_confidence += variance_adjustment
-            
-            return min(base_confidence, 0.95)
-            
-        except Exception as e:
-            logger.error(f"Failed to calculate drift confidence: {str(e)}")
-            return 0.0
+        # Higher score and lower variance = higher confidence
+        base_confidence = _BASE_CONFIDENCE[bisect_left(_CONFIDENCE_CUTS, combined_score)]
+        
+        # Adjust based on agreement between methods; plain Python beats a
+        # NumPy call for the handful of detector scores
+        n_scores = len(individual_scores)
+        if n_scores > 1:
+            mean_score = sum(individual_scores) / n_scores
+            score_variance = sum((s - mean_score) ** 2 for s in individual_scores) / n_scores
+            # Lower variance = higher confidence
+            variance_adjustment = max(0, 0.2 - score_variance)
+            base_confidence += variance_adjustment
+        
+        return min(base_confidence, 0.95)
     
     def _determine_drift_type(self, drift_results: Dict[str, Dict[str, Any]]) -> Optional[str]:
         """Determine the type of drift detected."""
-        try:
-            # Find method with highest score
-            max_score = 0.0
-            dominant_method = None
-            
-            for method, result in drift_results.items():
-                score = result.get('score', 0.0)
-                if score > max_score:
-                    max_score = score
-                    dominant_method = method
-            
-            # Map method to drift type
-            drift_type_mapping = {
-                'statistical': 'statistical_drift',
-                'distance_based': 'distribution_drift',
-                'distribution_shift': 'distributional_drift'
-            }
-            
-            return drift_type_mapping.get(dominant_method)
-            
-        except Exception as e:
-            logger.error(f"Failed to determine drift type: {str(e)}")
-            return None
+        # Argmax over the detector scores (first wins ties); three floats do not need NumPy
+        scores = [drift_results.get(method, {}).get('score', 0.0) for method in _DRIFT_METHODS]
+        dominant = max(range(len(scores)), key=scores.__getitem__)
+        
+        # Map method to drift type
+        return _DRIFT_TYPES[dominant] if scores[dominant] > 0 else None
     
     def _generate_drift_explanation(
         self,
@@ -553,96 +839,92 @@ class BehavioralDriftDetector:
         is_drift: bool
     ) -> Dict[str, Any]:
         """Generate explanation for drift detection."""
-        try:
-            explanation = {
-                'combined_score': combined_score,
-                'threshold': self.drift_threshold,
-                'is_drift': is_drift,
-                'methods_used': list(drift_results.keys())
-            }
-            
-            # Add method-specific details
-            for method, result in drift_results.items():
-                explanation[f'{method}_score'] = result.get('score', 0.0)
-                
-                if method == 'statistical':
-                    significant_features = result.get('significant_features', [])
-                    if significant_features:
-                        explanation['significant_statistical_features'] = significant_features[:5]
-                
-                elif method == 'distance_based':
-                    mean_distance = result.get('mean_distance', 0.0)
-                    explanation['mean_distance_to_reference'] = mean_distance
-                
-                elif method == 'distribution_shift':
-                    ks_stats = result.get('ks_statistics', {})
-                    if ks_stats:
-                        # Find features with highest KS statistics
-                        sorted_features = sorted(
-                            ks_stats.items(),
-                            key=lambda x: x[1]['statistic'],
-                            reverse=True
-                        )
-                        explanation['top_shifted_features'] = [f[0] for f in sorted_features[:3]]
-            
-            # Generate summary text
-            if is_drift:
-                explanation['summary'] = f"Behavioral drift detected (score: {combined_score:.3f}). "
-                explanation['summary'] += f"Threshold exceeded: {combined_score:.3f} > {self.drift_threshold}"
-            else:
-                explanation['summary'] = f"No significant drift detected (score: {combined_score:.3f}). "
-                explanation['summary'] += f"Below threshold: {combined_score:.3f} <= {self.drift_threshold}"
-            
-            return explanation
-            
-        except Exception as e:
-            logger.error(f"Failed to generate drift explanation: {str(e)}")
-            return {'error': str(e)}
+        explanation = {
+            'combined_score': combined_score,
+            'threshold': self.drift_threshold,
+            'is_drift': is_drift,
+            'methods_used': list(drift_results.keys())
+        }
+        
+        # Add method-specific details
+        for method, result in drift_results.items():
+            explanation[f'{method}_score'] = result.get('score', 0.0)
+            
+            if method == 'statistical':
+                significant_features = result.get('significant_features', [])
+                if significant_features:
+                    explanation['significant_statistical_features'] = significant_features[:5]
+            
+            elif method == 'distance_based':
+                mean_distance = result.get('mean_distance', 0.0)
+                explanation['mean_distance_to_reference'] = mean_distance
+            
+            elif method == 'distribution_shift':
+                ks_stats = result.get('ks_statistics', {})
+                if ks_stats:
+                    # Find features with highest KS statistics
+                    sorted_features = sorted(
+                        ks_stats.items(),
+                        key=lambda x: x[1]['statistic'],
+                        reverse=True
+                    )
+                    explanation['top_shifted_features'] = [f[0] for f in sorted_features[:3]]
+        
+        # Generate summary text
+        if is_drift:
+            explanation['summary'] = f"Behavioral drift detected (score: {combined_score:.3f}). "
+            explanation['summary'] += f"Threshold exceeded: {combined_score:.3f} > {self.drift_threshold}"
+        else:
+            explanation['summary'] = f"No significant drift detected (score: {combined_score:.3f}). "
+            explanation['summary'] += f"Below threshold: {combined_score:.3f} <= {self.drift_threshold}"
+        
+        return explanation
     
-    def _update_drift_statistics(self, entity_id: str, drift_result: Dict[str, Any]):
+    def _update_drift_statistics(self, entity_id: str, drift_result: Dict[str, Any], now: float):
         """Update drift statistics for entity."""
-        try:
-            if entity_id not in self.drift_statistics:
-                self.drift_statistics[entity_id] = {
-                    'drift_history': [],
-                    'false_positive_rate': 0.0,
-                    'sensitivity': 1.0,
-                    'last_drift_time': None,
-                    'drift_frequency': 0.0
-                }
-            
-            stats = self.drift_statistics[entity_id]
-            
-            # Add to drift history
-            drift_event = {
-                'timestamp': datetime.utcnow().isoformat(),
-                'score': drift_result['score'],
-                'is_drift': drift_result['is_drift'],
-                'drift_type': drift_result['drift_type']
-            }
-            
-            stats['drift_history'].append(drift_event)
-            
-            # Limit history size
-            if len(stats['drift_history']) > 1000:
-                stats['drift_history'] = stats['drift_history'][-1000:]
-            
-            # Update last drift time
-            if drift_result['is_drift']:
-                stats['last_drift_time'] = drift_event['timestamp']
-            
-            # Calculate drift frequency (drifts per day)
-            if len(stats['drift_history']) > 1:
-                first_event = datetime.fromisoformat(stats['drift_history'][0]['timestamp'])
-                last_event = datetime.fromisoformat(stats['drift_history'][-1]['timestamp'])
-                time_span = (last_event - first_event).total_seconds() / 86400  # days
-                
-                if time_span > 0:
-                    drift_count = sum(1 for event in stats['drift_history'] if event['is_drift'])
-                    stats['drift_frequency'] = drift_count / time_span
+        if entity_id not in self.drift_statistics:
+            self.drift_statistics[entity_id] = self._new_drift_statistics()
+        
+        stats = self.drift_statistics[entity_id]
+        history = stats['drift_history']
+        if not isinstance(history, deque):  # List history from older saved models
+            history = stats['drift_history'] = deque(history, maxlen=_DRIFT_HISTORY_SIZE)
+        
+        # Statistics saved before incremental bookkeeping: derive it once from the history
+        if 'drift_count' not in stats:
+            stats['drift_count'] = sum(1 for event in history if event['is_drift'])
+            stats['first_event_time'] = (
+                _epoch_seconds(history[0]['timestamp'], now) if history else None
+            )
+        
+        # Add to drift history
+        drift_event = {
+            'timestamp': now,
+            'score': drift_result['score'],
+            'is_drift': drift_result['is_drift'],
+            'drift_type': drift_result['drift_type']
+        }
+        
+        # A full history evicts its oldest event on append
+        evicted = history[0] if len(history) == history.maxlen else None
+        history.append(drift_event)
+        stats['drift_count'] += int(drift_event['is_drift'])
+        if evicted is not None:
+            stats['drift_count'] -= int(evicted['is_drift'])
+            stats['first_event_time'] = _epoch_seconds(history[0]['timestamp'], now)
+        elif stats['first_event_time'] is None:
+            stats['first_event_time'] = now
+        
+        # Update last drift time
+        if drift_result['is_drift']:
+            stats['last_drift_time'] = drift_event['timestamp']
+        
+        # Calculate drift frequency (drifts per day)
+        if len(history) > 1:
+            time_span = (now - stats['first_event_time']) / 86400  # days
             
-        except Exception as e:
-            logger.error(f"Failed to update drift statistics: {str(e)}")
+            if time_span > 0:
+                stats['drift_frequency'] = stats['drift_count'] / time_span
     
     def save_model(self, filepath: str) -> None:
         """Save the drift detector to disk."""
@@ -677,11 +959,14 @@ class BehavioralDriftDetector:
         self.window_size = model_data['window_size']
         self.drift_threshold = model_data['drift_threshold']
         self.min_samples = model_data['min_samples']
+        for reference in self.reference_distributions.values():
+            self._upgrade_reference_sample(reference)
         
         # Reinitialize entity windows (they are not saved due to memory constraints)
         self.entity_windows = {}
         for entity_id in self.reference_distributions.keys():
-            self.entity_windows[entity_id] = deque(maxlen=self.window_size)
+            self.entity_windows[entity_id] = self._new_entity_window(entity_id)
+        self._cache_reference_stats()
         
         logger.info(f"Behavioral drift detector loaded from {filepath}")
     
@@ -5,15 +5,63 @@ import pandas as pd
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
-from sklearn.metrics.pairwise import cosine_similarity
+import os
+import pickle
 from sklearn.preprocessing import StandardScaler
 from sklearn.cluster import DBSCAN
 import joblib
 
 from ...config import model_config
+from ...utils.persistence import joblib_compression, save_array
 
 logger = logging.getLogger(__name__)
 
+# cuML is optional - GPU clustering is only used when it is installed
+try:
+    from cuml.cluster import DBSCAN as CumlDBSCAN
+    CUML_AVAILABLE = True
+except ImportError:
+    CUML_AVAILABLE = False
+    CumlDBSCAN = None
+
+# Activity columns and the profile keys their per-entity means are stored under
+_ACTIVITY_FEATURES = (
+    ('activity_count', 'avg_activity_count'),
+    ('access_frequency', 'avg_access_frequency'),
+    ('resource_usage', 'avg_resource_usage'),
+    ('error_rate', 'avg_error_rate'),
+)
+
+# Behavioral vector components after the sorted feature means: (profile section, key, divisor)
+_VECTOR_FIELDS = (
+    ('activity_patterns', 'avg_activity_count', 1.0),
+    ('activity_patterns', 'avg_access_frequency', 1.0),
+    ('activity_patterns', 'avg_resource_usage', 1.0),
+    ('activity_patterns', 'avg_error_rate', 1.0),
+    ('temporal_patterns', 'peak_hour', 24.0),  # Normalize to [0,1]
+    ('temporal_patterns', 'peak_day', 7.0),    # Normalize to [0,1]
+    ('temporal_patterns', 'avg_session_duration', 1.0),
+    ('network_patterns', 'unique_ips', 1.0),
+    ('network_patterns', 'ip_diversity', 1.0),
+    ('network_patterns', 'unique_locations', 1.0),
+    ('network_patterns', 'unique_user_agents', 1.0),
+)
+
+# NaN or infinite features leave the similarity undefined; such events get the error result
+_NON_FINITE_ERROR = "Input contains NaN or infinity"
+
+
+def _parse_timestamp(value: Any) -> datetime:
+    """Parse a single event timestamp, taking the stdlib fast path for datetimes and ISO-8601 strings."""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    return pd.to_datetime(value)
+
 
 class EntityMorphingDetector:
     """Detector for identifying when entities morph or change their behavioral patterns."""
@@ -39,9 +87,30 @@ class EntityMorphingDetector:
         self.behavioral_baselines = {}
         self.morphing_patterns = {}
         
+        # Training-time profile table: one row per entity, one column per behavioral vector component
+        self._profile_df = pd.DataFrame()
+        
+        # Baseline unit vectors stacked row-wise for batch scoring, plus direct per-entity lookups
+        self._baseline_matrix = np.empty((0, 0), dtype=np.float32)
+        self._baseline_index = {}
+        self._baseline_vectors = {}
+        self._baseline_width = 0
+        
         # Clustering for morphing pattern detection
-        self.clustering_model = DBSCAN(eps=0.3, min_samples=5)
+        self.n_jobs = model_config['global']['n_jobs']
+        self.use_gpu = self.config.get('use_gpu', False)
+        if self.use_gpu and not CUML_AVAILABLE:
+            logger.warning("use_gpu is set but cuML is not installed, using the CPU DBSCAN")
+            self.use_gpu = False
+        self.clustering_model = self._build_clustering_model()
+        
+    def _build_clustering_model(self):
+        """Create the DBSCAN model for morphing patterns, on the GPU when enabled."""
+        if self.use_gpu:
+            return CumlDBSCAN(eps=0.3, min_samples=5, output_type='numpy')
         
+        return DBSCAN(eps=0.3, min_samples=5, algorithm='ball_tree', n_jobs=self.n_jobs)
+    
     async def train(self, X: pd.DataFrame, y: Optional[pd.Series] = None) -> Dict[str, Any]:
         """Train the entity morphing detector."""
         logger.info("Training entity morphing detector...")
@@ -111,107 +180,154 @@ class EntityMorphingDetector:
                 'explanation': {'error': str(e)}
             }
     
+    async def predict_batch(self, features_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Predict morphing for a batch of observations, scoring stacked baselines in one pass."""
+        if not self.is_trained:
+            raise ValueError("Model must be trained before making predictions")
+        
+        results = [None] * len(features_list)
+        pending = []  # (position, behavioral features, baseline, current vector, matrix row)
+        
+        for i, features in enumerate(features_list):
+            try:
+                entity_id = features.get('entity_id', 'unknown')
+                behavioral_features = self._extract_behavioral_features(features)
+                
+                key = entity_id if entity_id in self.behavioral_baselines else 'general'
+                row = self._baseline_index.get(key)
+                current_vector = None
+                if row is not None:
+                    current_profile = self._create_current_profile(behavioral_features)
+                    current_vector = self._create_behavioral_vector(current_profile)
+                
+                if current_vector is None or len(current_vector) != self._baseline_width:
+                    # Unknown entity or mismatched dimensions: use the per-entity path
+                    results[i] = self._detect_morphing(entity_id, behavioral_features, features)
+                else:
+                    pending.append((i, behavioral_features, self.behavioral_baselines[key], current_vector, row))
+                    
+            except Exception as e:
+                logger.error(f"Prediction failed: {str(e)}")
+                results[i] = {
+                    'score': 0.0,
+                    'is_morphing': False,
+                    'confidence': 0.0,
+                    'type': None,
+                    'drift': 0.0,
+                    'explanation': {'error': str(e)}
+                }
+        
+        if pending:
+            queries = np.vstack([item[3] for item in pending]).astype(np.float32, copy=False)
+            norms = np.linalg.norm(queries, axis=1)
+            queries /= np.where(norms > 0, norms, 1.0)[:, None]
+            rows = np.fromiter((item[4] for item in pending), dtype=np.intp, count=len(pending))
+            similarities = np.einsum('ij,ij->i', queries, self._baseline_matrix[rows])
+            
+            for (i, behavioral_features, baseline, _, _), similarity in zip(pending, similarities.tolist()):
+                if not np.isfinite(similarity):
+                    logger.error(f"Failed to detect morphing: {_NON_FINITE_ERROR}")
+                    results[i] = {
+                        'score': 0.0,
+                        'is_morphing': False,
+                        'confidence': 0.0,
+                        'type': None,
+                        'drift': 0.0,
+                        'explanation': {'error': _NON_FINITE_ERROR}
+                    }
+                    continue
+                results[i] = self._morphing_result(1.0 - similarity, similarity, behavioral_features, baseline)
+        
+        return results
+    
     def _build_entity_profiles(self, X: pd.DataFrame):
         """Build behavioral profiles for entities."""
         try:
-            # Group by entity_id if available
+            # Group by entity_id if available, otherwise create a general profile
             if 'entity_id' in X.columns:
-                for entity_id, entity_data in X.groupby('entity_id'):
-                    profile = self._create_entity_profile(entity_data)
-                    self.entity_profiles[entity_id] = profile
+                keys = X['entity_id']
+            else:
+                keys = pd.Series('general', index=X.index)
+            groups = X.groupby(keys)
+            
+            # Feature statistics for every entity in one grouped pass
+            numeric_columns = list(X.select_dtypes(include=[np.number]).columns)
+            if numeric_columns:
+                stats = groups[numeric_columns].agg(['mean', 'std'])
+                feature_means = stats.xs('mean', axis=1, level=1).to_dict('index')
+                feature_stds = stats.xs('std', axis=1, level=1).to_dict('index')
             else:
-                # Create a general profile if no entity_id
-                profile = self._create_entity_profile(X)
-                self.entity_profiles['general'] = profile
+                feature_means, feature_stds = {}, {}
+            activity_variance = groups['activity_count'].var().to_dict() if 'activity_count' in numeric_columns else {}
+            sample_counts = groups.size().to_dict()
+            temporal_patterns = self._extract_temporal_patterns(X, keys)
+            
+            for entity_id, entity_data in groups:
+                means = feature_means.get(entity_id, {})
+                activity_patterns = {name: means[col] for col, name in _ACTIVITY_FEATURES if col in means}
+                if entity_id in activity_variance:
+                    activity_patterns['activity_variance'] = activity_variance[entity_id]
+                
+                self.entity_profiles[entity_id] = {
+                    'sample_count': sample_counts[entity_id],
+                    'feature_means': means,
+                    'feature_stds': feature_stds.get(entity_id, {}),
+                    'activity_patterns': activity_patterns,
+                    'temporal_patterns': temporal_patterns.get(entity_id, {}),
+                    'network_patterns': self._extract_network_patterns(entity_data)
+                }
+            
+            self._build_profile_table()
                 
             logger.info(f"Built {len(self.entity_profiles)} entity profiles")
             
         except Exception as e:
             logger.error(f"Failed to build entity profiles: {str(e)}")
     
-    def _create_entity_profile(self, entity_data: pd.DataFrame) -> Dict[str, Any]:
-        """Create a behavioral profile for a single entity."""
-        try:
-            profile = {
-                'sample_count': len(entity_data),
-                'feature_means': {},
-                'feature_stds': {},
-                'activity_patterns': {},
-                'temporal_patterns': {},
-                'network_patterns': {}
-            }
-            
-            # Calculate feature statistics
-            numeric_columns = entity_data.select_dtypes(include=[np.number]).columns
-            for col in numeric_columns:
-                profile['feature_means'][col] = float(entity_data[col].mean())
-                profile['feature_stds'][col] = float(entity_data[col].std())
-            
-            # Extract activity patterns
-            profile['activity_patterns'] = self._extract_activity_patterns(entity_data)
-            
-            # Extract temporal patterns
-            profile['temporal_patterns'] = self._extract_temporal_patterns(entity_data)
-            
-            # Extract network patterns
-            profile['network_patterns'] = self._extract_network_patterns(entity_data)
-            
-            return profile
-            
-        except Exception as e:
-            logger.error(f"Failed to create entity profile: {str(e)}")
-            return {}
-    
-    def _extract_activity_patterns(self, data: pd.DataFrame) -> Dict[str, Any]:
-        """Extract activity patterns from entity data."""
-        patterns = {}
+    def _build_profile_table(self) -> None:
+        """Lay the entity profiles out column-wise, in behavioral vector order."""
+        profiles = list(self.entity_profiles.values())
+        feature_names = sorted({name for profile in profiles for name in profile.get('feature_means', {})})
         
-        try:
-            # Activity frequency patterns
-            if 'activity_count' in data.columns:
-                patterns['avg_activity_count'] = float(data['activity_count'].mean())
-                patterns['activity_variance'] = float(data['activity_count'].var())
-            
-            # Access patterns
-            if 'access_frequency' in data.columns:
-                patterns['avg_access_frequency'] = float(data['access_frequency'].mean())
-            
-            # Resource usage patterns
-            if 'resource_usage' in data.columns:
-                patterns['avg_resource_usage'] = float(data['resource_usage'].mean())
-            
-            # Error rate patterns
-            if 'error_rate' in data.columns:
-                patterns['avg_error_rate'] = float(data['error_rate'].mean())
-                
-        except Exception as e:
-            logger.warning(f"Failed to extract activity patterns: {str(e)}")
+        columns = {
+            f"mean_{name}": [profile.get('feature_means', {}).get(name, 0.0) for profile in profiles]
+            for name in feature_names
+        }
+        for section, key, divisor in _VECTOR_FIELDS:
+            columns[key] = [profile.get(section, {}).get(key, 0.0) / divisor for profile in profiles]
         
-        return patterns
+        self._profile_df = pd.DataFrame(columns, index=pd.Index(list(self.entity_profiles), name='entity_id'))
     
-    def _extract_temporal_patterns(self, data: pd.DataFrame) -> Dict[str, Any]:
-        """Extract temporal patterns from entity data."""
+    def _extract_temporal_patterns(self, X: pd.DataFrame, keys: pd.Series) -> Dict[Any, Dict[str, Any]]:
+        """Extract temporal patterns for every entity, keyed by entity."""
         patterns = {}
         
         try:
-            # Time-based patterns
-            if 'timestamp' in data.columns:
-                timestamps = pd.to_datetime(data['timestamp'])
+            # Time-based patterns, parsed once for the whole frame
+            if 'timestamp' in X.columns:
+                timestamps = pd.to_datetime(X['timestamp'])
                 
-                # Hour of day patterns
-                hours = timestamps.dt.hour
-                patterns['active_hours'] = hours.value_counts().to_dict()
-                patterns['peak_hour'] = int(hours.mode().iloc[0]) if not hours.empty else 0
-                
-                # Day of week patterns
-                days = timestamps.dt.dayofweek
-                patterns['active_days'] = days.value_counts().to_dict()
-                patterns['peak_day'] = int(days.mode().iloc[0]) if not days.empty else 0
+                # Hour of day and day of week patterns
+                for active_key, peak_key, component in (
+                    ('active_hours', 'peak_hour', timestamps.dt.hour),
+                    ('active_days', 'peak_day', timestamps.dt.dayofweek)
+                ):
+                    counts = component.groupby([keys, component]).size()
+                    for (entity_id, value), count in counts.to_dict().items():
+                        patterns.setdefault(entity_id, {}).setdefault(active_key, {})[value] = count
+                    
+                    # Values are sorted within each entity, so ties resolve to the smallest like mode()
+                    for entity_id, (_, value) in counts.groupby(level=0).idxmax().items():
+                        patterns[entity_id][peak_key] = int(value)
             
             # Session duration patterns
-            if 'session_duration' in data.columns:
-                patterns['avg_session_duration'] = float(data['session_duration'].mean())
-                patterns['session_duration_variance'] = float(data['session_duration'].var())
+            if 'session_duration' in X.columns:
+                session_stats = X['session_duration'].groupby(keys).agg(['mean', 'var'])
+                for entity_id, mean, variance in zip(session_stats.index, session_stats['mean'].tolist(),
+                                                     session_stats['var'].tolist()):
+                    entity_patterns = patterns.setdefault(entity_id, {})
+                    entity_patterns['avg_session_duration'] = float(mean)
+                    entity_patterns['session_duration_variance'] = float(variance)
                 
         except Exception as e:
             logger.warning(f"Failed to extract temporal patterns: {str(e)}")
@@ -250,98 +366,126 @@ class EntityMorphingDetector:
     def _establish_baselines(self, X: pd.DataFrame):
         """Establish behavioral baselines for morphing detection."""
         try:
-            for entity_id, profile in self.entity_profiles.items():
-                baseline = {
-                    'behavioral_vector': self._create_behavioral_vector(profile),
+            # Behavioral vectors for every entity are rows of the profile table
+            vectors = self._profile_df.to_numpy(dtype=np.float32)
+            norms = np.linalg.norm(vectors, axis=1)
+            units = vectors / np.where(norms > 0, norms, 1.0)[:, None]
+            established_at = datetime.utcnow().isoformat()
+            
+            for entity_id, vector, norm, unit in zip(self._profile_df.index, vectors, norms.tolist(), units):
+                profile = self.entity_profiles[entity_id]
+                self.behavioral_baselines[entity_id] = {
+                    'behavioral_vector': vector,
                     'activity_baseline': profile.get('activity_patterns', {}),
                     'temporal_baseline': profile.get('temporal_patterns', {}),
                     'network_baseline': profile.get('network_patterns', {}),
-                    'established_at': datetime.utcnow().isoformat()
+                    'established_at': established_at,
+                    'behavioral_vector_norm': norm,
+                    'behavioral_vector_unit': unit
                 }
-                
-                self.behavioral_baselines[entity_id] = baseline
+            
+            self._stack_baselines()
                 
             logger.info(f"Established {len(self.behavioral_baselines)} behavioral baselines")
             
         except Exception as e:
             logger.error(f"Failed to establish baselines: {str(e)}")
     
+    @staticmethod
+    def _unit_vector(vector: np.ndarray) -> np.ndarray:
+        """Scale a vector to unit length, leaving zero vectors as they are."""
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+    
+    @classmethod
+    def _add_unit_vector(cls, baseline: Dict[str, Any]) -> None:
+        """Store the baseline vector's norm and direction so predictions only need a dot product."""
+        vector = baseline.get('behavioral_vector', np.array([0.0]))
+        baseline['behavioral_vector_norm'] = float(np.linalg.norm(vector))
+        baseline['behavioral_vector_unit'] = cls._unit_vector(vector)
+    
+    def _stack_baselines(self) -> None:
+        """Stack baseline unit vectors into one matrix indexed by entity."""
+        units = {entity_id: baseline['behavioral_vector_unit']
+                 for entity_id, baseline in self.behavioral_baselines.items()}
+        
+        # Baselines share one width; any odd one out stays on the per-entity path
+        lengths = [len(unit) for unit in units.values()]
+        width = max(set(lengths), key=lengths.count) if lengths else 0
+        entity_ids = [entity_id for entity_id, unit in units.items() if len(unit) == width]
+        
+        self._baseline_index = {entity_id: i for i, entity_id in enumerate(entity_ids)}
+        self._baseline_matrix = (np.ascontiguousarray(np.vstack([units[entity_id] for entity_id in entity_ids]),
+                                                      dtype=np.float32)
+                                 if entity_ids else np.empty((0, width), dtype=np.float32))
+        self._index_baseline_vectors()
+    
+    def _index_baseline_vectors(self) -> None:
+        """Map each entity to its baseline unit vector, reading stacked entities from the matrix."""
+        self._baseline_width = self._baseline_matrix.shape[1]
+        
+        # Stacked entities read their matrix row, so single and batch predictions share one copy
+        self._baseline_vectors = {entity_id: baseline['behavioral_vector_unit']
+                                  for entity_id, baseline in self.behavioral_baselines.items()}
+        for entity_id, row in self._baseline_index.items():
+            self._baseline_vectors[entity_id] = self._baseline_matrix[row]
+    
     def _create_behavioral_vector(self, profile: Dict[str, Any]) -> np.ndarray:
         """Create a numerical vector representing entity behavior."""
         try:
-            vector_components = []
-            
-            # Add feature means (normalized)
+            # Feature means, then activity, temporal and network components (same layout as the profile table)
             feature_means = profile.get('feature_means', {})
-            for key in sorted(feature_means.keys()):
-                vector_components.append(feature_means[key])
-            
-            # Add activity pattern components
-            activity_patterns = profile.get('activity_patterns', {})
-            vector_components.extend([
-                activity_patterns.get('avg_activity_count', 0.0),
-                activity_patterns.get('avg_access_frequency', 0.0),
-                activity_patterns.get('avg_resource_usage', 0.0),
-                activity_patterns.get('avg_error_rate', 0.0)
-            ])
-            
-            # Add temporal pattern components
-            temporal_patterns = profile.get('temporal_patterns', {})
-            vector_components.extend([
-                temporal_patterns.get('peak_hour', 0.0) / 24.0,  # Normalize to [0,1]
-                temporal_patterns.get('peak_day', 0.0) / 7.0,    # Normalize to [0,1]
-                temporal_patterns.get('avg_session_duration', 0.0)
-            ])
-            
-            # Add network pattern components
-            network_patterns = profile.get('network_patterns', {})
-            vector_components.extend([
-                network_patterns.get('unique_ips', 0.0),
-                network_patterns.get('ip_diversity', 0.0),
-                network_patterns.get('unique_locations', 0.0),
-                network_patterns.get('unique_user_agents', 0.0)
-            ])
-            
-            return np.array(vector_components, dtype=float)
+            vector_components = [feature_means[key] for key in sorted(feature_means.keys())]
+            vector_components.extend(
+                profile.get(section, {}).get(key, 0.0) / divisor for section, key, divisor in _VECTOR_FIELDS
+            )
+            
+            # Single precision is ample for cosine similarity and keeps the baseline matrix compact
+            return np.asarray(vector_components, dtype=np.float32)
             
         except Exception as e:
             logger.error(f"Failed to create behavioral vector: {str(e)}")
-            return np.array([0.0])
+            return np.zeros(1, dtype=np.float32)
     
     def _detect_morphing_patterns(self, X: pd.DataFrame):
         """Detect common morphing patterns in the training data."""
         try:
-            # Create behavioral vectors for all entities
-            vectors = []
-            entity_ids = []
-            
-            for entity_id, profile in self.entity_profiles.items():
-                vector = self._create_behavioral_vector(profile)
-                if len(vector) > 1:  # Valid vector
-                    vectors.append(vector)
-                    entity_ids.append(entity_id)
+            # Behavioral vectors for all entities, straight from the profile table
+            vectors_array = self._profile_df.to_numpy(dtype=np.float32)
+            entity_ids = list(self._profile_df.index)
             
-            if len(vectors) > 0:
+            # With fewer entities than min_samples every point is noise, so skip the fit
+            if len(vectors_array) >= self.clustering_model.min_samples:
                 # Normalize vectors
-                vectors_array = np.array(vectors)
-                if vectors_array.shape[1] > 0:
+                if vectors_array.shape[1] > 1:
                     vectors_normalized = self.scaler.fit_transform(vectors_array)
                     
                     # Cluster entities to find morphing patterns
                     clusters = self.clustering_model.fit_predict(vectors_normalized)
                     
-                    # Analyze clusters for morphing patterns
-                    for cluster_id in set(clusters):
-                        if cluster_id != -1:  # Ignore noise points
-                            cluster_entities = [entity_ids[i] for i, c in enumerate(clusters) if c == cluster_id]
-                            cluster_vectors = vectors_normalized[clusters == cluster_id]
-                            
+                    # Analyze clusters for morphing patterns, ignoring noise points;
+                    # members are sorted by cluster so each statistic is one segmented reduction
+                    members = np.flatnonzero(clusters != -1)
+                    if len(members) > 0:
+                        members = members[np.argsort(clusters[members], kind='stable')]
+                        cluster_ids, starts, sizes = np.unique(clusters[members], return_index=True,
+                                                               return_counts=True)
+                        cluster_vectors = vectors_normalized[members].astype(np.float64)
+                        
+                        centroids = np.add.reduceat(cluster_vectors, starts, axis=0) / sizes[:, None]
+                        deviations = cluster_vectors - np.repeat(centroids, sizes, axis=0)
+                        variances = np.add.reduceat(deviations * deviations, starts, axis=0) / sizes[:, None]
+                        
+                        dtype = vectors_normalized.dtype
+                        for cluster_id, start, size, centroid, variance in zip(
+                            cluster_ids, starts, sizes, centroids.astype(dtype), variances.astype(dtype)
+                        ):
                             pattern = {
                                 'cluster_id': cluster_id,
-                                'entities': cluster_entities,
-                                'centroid': np.mean(cluster_vectors, axis=0),
-                                'variance': np.var(cluster_vectors, axis=0),
-                                'size': len(cluster_entities)
+                                'entities': [entity_ids[i] for i in members[start:start + size]],
+                                'centroid': centroid,
+                                'variance': variance,
+                                'size': int(size)
                             }
                             
                             self.morphing_patterns[f"pattern_{cluster_id}"] = pattern
@@ -364,9 +508,9 @@ class EntityMorphingDetector:
             
             # Temporal features
             if 'timestamp' in features:
-                timestamp = pd.to_datetime(features['timestamp'])
+                timestamp = _parse_timestamp(features['timestamp'])
                 behavioral_features['hour_of_day'] = timestamp.hour
-                behavioral_features['day_of_week'] = timestamp.dayofweek
+                behavioral_features['day_of_week'] = timestamp.weekday()
             
             # Network features
             behavioral_features['source_ip'] = features.get('source_ip', '')
@@ -388,8 +532,8 @@ class EntityMorphingDetector:
         """Detect if entity is morphing based on current behavior vs baseline."""
         try:
             # Get baseline for entity (or use general baseline)
-            baseline = self.behavioral_baselines.get(entity_id, 
-                                                   self.behavioral_baselines.get('general', {}))
+            key = entity_id if entity_id in self.behavioral_baselines else 'general'
+            baseline = self.behavioral_baselines.get(key, {})
             
             if not baseline:
                 return {
@@ -405,45 +549,26 @@ class EntityMorphingDetector:
             current_profile = self._create_current_profile(current_features)
             current_vector = self._create_behavioral_vector(current_profile)
             
-            # Compare with baseline
-            baseline_vector = baseline.get('behavioral_vector', np.array([0.0]))
+            # Compare with baseline direction (normalized at training time)
+            baseline_unit = self._baseline_vectors[key]
             
-            if len(current_vector) != len(baseline_vector):
+            if len(current_vector) != len(baseline_unit):
                 # Pad or truncate to match dimensions
-                min_len = min(len(current_vector), len(baseline_vector))
+                min_len = min(len(current_vector), len(baseline_unit))
                 current_vector = current_vector[:min_len]
-                baseline_vector = baseline_vector[:min_len]
+                baseline_unit = self._unit_vector(baseline_unit[:min_len])
             
-            # Calculate similarity
-            if len(current_vector) > 0 and len(baseline_vector) > 0:
-                similarity = cosine_similarity([current_vector], [baseline_vector])[0][0]
+            # Calculate similarity; a zero vector has no direction and scores as dissimilar
+            if len(current_vector) > 0 and len(baseline_unit) > 0:
+                similarity = float(self._unit_vector(current_vector) @ baseline_unit)
+                if not np.isfinite(similarity):
+                    raise ValueError(_NON_FINITE_ERROR)
                 morphing_score = 1.0 - similarity  # Higher score = more morphing
             else:
                 morphing_score = 0.0
                 similarity = 1.0
             
-            # Determine morphing type
-            morphing_type = self._determine_morphing_type(current_features, baseline)
-            
-            # Calculate confidence
-            confidence = self._calculate_morphing_confidence(morphing_score, similarity)
-            
-            # Calculate drift score
-            drift_score = self._calculate_drift_score(current_features, baseline)
-            
-            # Generate explanation
-            explanation = self._generate_morphing_explanation(
-                morphing_score, similarity, morphing_type, current_features, baseline
-            )
-            
-            return {
-                'score': float(morphing_score),
-                'is_morphing': morphing_score > self.similarity_threshold,
-                'confidence': float(confidence),
-                'type': morphing_type,
-                'drift': float(drift_score),
-                'explanation': explanation
-            }
+            return self._morphing_result(morphing_score, similarity, current_features, baseline)
             
         except Exception as e:
             logger.error(f"Failed to detect morphing: {str(e)}")
@@ -456,6 +581,37 @@ class EntityMorphingDetector:
                 'explanation': {'error': str(e)}
             }
     
+    def _morphing_result(
+        self,
+        morphing_score: float,
+        similarity: float,
+        current_features: Dict[str, Any],
+        baseline: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build the morphing result for a scored observation."""
+        # Determine morphing type
+        morphing_type = self._determine_morphing_type(current_features, baseline)
+        
+        # Calculate confidence
+        confidence = self._calculate_morphing_confidence(morphing_score, similarity)
+        
+        # Calculate drift score
+        drift_score = self._calculate_drift_score(current_features, baseline)
+        
+        # Generate explanation
+        explanation = self._generate_morphing_explanation(
+            morphing_score, similarity, morphing_type, current_features, baseline
+        )
+        
+        return {
+            'score': float(morphing_score),
+            'is_morphing': morphing_score > self.similarity_threshold,
+            'confidence': float(confidence),
+            'type': morphing_type,
+            'drift': float(drift_score),
+            'explanation': explanation
+        }
+    
     def _create_current_profile(self, features: Dict[str, Any]) -> Dict[str, Any]:
         """Create a profile from current features."""
         profile = {
@@ -480,10 +636,10 @@ class EntityMorphingDetector:
         
         # Temporal patterns
         if 'timestamp' in features:
-            timestamp = pd.to_datetime(features['timestamp'])
+            timestamp = _parse_timestamp(features['timestamp'])
             profile['temporal_patterns'] = {
                 'peak_hour': timestamp.hour,
-                'peak_day': timestamp.dayofweek
+                'peak_day': timestamp.weekday()
             }
         
         # Network patterns
@@ -516,7 +672,7 @@ class EntityMorphingDetector:
             
             # Temporal morphing
             if 'timestamp' in current_features:
-                current_hour = pd.to_datetime(current_features['timestamp']).hour
+                current_hour = _parse_timestamp(current_features['timestamp']).hour
                 baseline_hour = baseline.get('temporal_baseline', {}).get('peak_hour', current_hour)
                 
                 if abs(current_hour - baseline_hour) > 6:  # More than 6 hours difference
@@ -546,36 +702,30 @@ class EntityMorphingDetector:
             return 0.0
     
     def _calculate_drift_score(self, current_features: Dict[str, Any], baseline: Dict[str, Any]) -> float:
-        """Calculate behavioral drift score."""
+        """Calculate behavioral drift score as the mean of the available drift components."""
         try:
-            drift_components = []
+            # Network drift (simplified) is always present; a changed IP is a complete network change
+            current_ip = current_features.get('source_ip', '')
+            baseline_ip = baseline.get('network_baseline', {}).get('primary_ip', '')
+            drift_total = 1.0 if baseline_ip and current_ip != baseline_ip else 0.0
+            component_count = 1
             
             # Activity drift
             current_activity = current_features.get('activity_count', 0)
             baseline_activity = baseline.get('activity_baseline', {}).get('avg_activity_count', 0)
             
             if baseline_activity > 0:
-                activity_drift = abs(current_activity - baseline_activity) / baseline_activity
-                drift_components.append(activity_drift)
+                drift_total += abs(current_activity - baseline_activity) / baseline_activity
+                component_count += 1
             
             # Temporal drift
             if 'timestamp' in current_features:
-                current_hour = pd.to_datetime(current_features['timestamp']).hour
+                current_hour = _parse_timestamp(current_features['timestamp']).hour
                 baseline_hour = baseline.get('temporal_baseline', {}).get('peak_hour', current_hour)
-                
-                hour_drift = abs(current_hour - baseline_hour) / 24.0
-                drift_components.append(hour_drift)
+                drift_total += abs(current_hour - baseline_hour) / 24.0
+                component_count += 1
             
-            # Network drift (simplified)
-            current_ip = current_features.get('source_ip', '')
-            baseline_ip = baseline.get('network_baseline', {}).get('primary_ip', '')
-            
-            if baseline_ip and current_ip != baseline_ip:
-                drift_components.append(1.0)  # Complete network change
-            else:
-                drift_components.append(0.0)
-            
-            return np.mean(drift_components) if drift_components else 0.0
+            return drift_total / component_count
             
         except Exception as e:
             logger.error(f"Failed to calculate drift score: {str(e)}")
@@ -635,18 +785,36 @@ class EntityMorphingDetector:
         if not self.is_trained:
             raise ValueError("Model must be trained before saving")
         
+        # Stacked unit vectors live in the baseline matrix file; only odd-width ones are pickled
+        baselines = {
+            entity_id: ({key: value for key, value in baseline.items() if key != 'behavioral_vector_unit'}
+                        if entity_id in self._baseline_index else baseline)
+            for entity_id, baseline in self.behavioral_baselines.items()
+        }
+        
         model_data = {
             'config': self.config,
             'entity_profiles': self.entity_profiles,
-            'behavioral_baselines': self.behavioral_baselines,
+            'behavioral_baselines': baselines,
             'morphing_patterns': self.morphing_patterns,
             'scaler': self.scaler,
             'clustering_model': self.clustering_model,
             'is_trained': self.is_trained,
-            'model_version': self.model_version
+            'model_version': self.model_version,
+            'baseline_index': self._baseline_index
         }
         
-        joblib.dump(model_data, filepath)
+        joblib.dump(
+            model_data,
+            filepath,
+            compress=joblib_compression(3),
+            protocol=pickle.HIGHEST_PROTOCOL
+        )
+        
+        # Uncompressed baseline matrix next to the pickle so workers can
+        # memory-map it and share one copy through the page cache
+        save_array(self._baseline_matrix_path(filepath), self._baseline_matrix)
+        
         logger.info(f"Entity morphing detector saved to {filepath}")
     
     async def load_model(self, filepath: str) -> None:
@@ -656,6 +824,25 @@ class EntityMorphingDetector:
         self.config = model_data['config']
         self.entity_profiles = model_data['entity_profiles']
         self.behavioral_baselines = model_data['behavioral_baselines']
+        
+        matrix_path = self._baseline_matrix_path(filepath)
+        stacked = 'baseline_index' in model_data and os.path.exists(matrix_path)
+        if stacked:
+            # Stacked unit vectors are rows of the mapped matrix rather than pickled copies
+            self._baseline_matrix = np.load(matrix_path, mmap_mode='r')
+            self._baseline_index = model_data['baseline_index']
+            for entity_id, row in self._baseline_index.items():
+                self.behavioral_baselines[entity_id]['behavioral_vector_unit'] = self._baseline_matrix[row]
+        
+        for baseline in self.behavioral_baselines.values():
+            if 'behavioral_vector_unit' not in baseline:
+                self._add_unit_vector(baseline)
+        
+        if stacked:
+            self._index_baseline_vectors()
+        else:
+            self._stack_baselines()
+        
         self.morphing_patterns = model_data['morphing_patterns']
         self.scaler = model_data['scaler']
         self.clustering_model = model_data['clustering_model']
@@ -664,6 +851,11 @@ class EntityMorphingDetector:
         
         logger.info(f"Entity morphing detector loaded from {filepath}")
     
+    @staticmethod
+    def _baseline_matrix_path(filepath: str) -> str:
+        """Path of the memory-mappable baseline matrix saved alongside a model."""
+        return f"{filepath}.baselines.npy"
+    
     async def get_model_info(self) -> Dict[str, Any]:
         """Get information about the morphing detector."""
         return {
@@ -0,0 +1,28 @@
+"""Optional Numba JIT support for numeric scoring kernels."""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Numba is optional - kernels fall back to plain Python and callers
+# should prefer their vectorized NumPy path when it is unavailable
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op replacement for numba.njit when Numba is not installed."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+# Below this many elements the thread start-up cost of a parallel kernel
+# outweighs the speedup over a single vectorized NumPy expression
+JIT_MIN_BATCH_SIZE = 1024
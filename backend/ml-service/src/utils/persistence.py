@@ -0,0 +1,39 @@
+"""Helpers for persisting model artifacts with joblib."""
+
+import logging
+import os
+import tempfile
+from typing import Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# LZ4 is optional - joblib raises on ('lz4', level) when it is not installed
+try:
+    import lz4  # noqa: F401
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+
+
+def joblib_compression(level: int = 1) -> Union[Tuple[str, int], int]:
+    """Return a joblib ``compress`` value: LZ4 at ``level`` when installed, otherwise uncompressed."""
+    return ('lz4', level) if LZ4_AVAILABLE else 0
+
+
+def save_array(path: str, array: np.ndarray) -> None:
+    """Write ``array`` to ``path`` as .npy through a temp file and ``os.replace``.
+    
+    ``path`` may be memory-mapped by the very model being saved; writing in place would
+    truncate the file under the mapping and save zeros, while replacing it leaves the
+    old mapping on the unlinked inode.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.npy.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, array)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
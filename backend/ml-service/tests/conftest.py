@@ -0,0 +1,7 @@
+"""Pytest configuration for the ML service tests."""
+
+import os
+import sys
+
+# Make the ``src`` package importable when pytest is run from any directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -0,0 +1,44 @@
+"""Tests for entity morphing scores on non-finite input."""
+
+import asyncio
+import math
+
+import numpy as np
+import pandas as pd
+
+from src.models.morphing.entity_morphing_detector import EntityMorphingDetector
+
+
+def _trained_detector() -> EntityMorphingDetector:
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(
+        rng.normal(size=(600, 3)) * [5, 1, 50] + [20, 2, 100],
+        columns=['activity_count', 'error_rate', 'login_frequency']
+    )
+    X['entity_id'] = [f'e{i}' for i in rng.integers(0, 4, len(X))]
+    # One entity whose training mean is NaN
+    X.loc[X['entity_id'] == 'e3', 'login_frequency'] = np.nan
+    
+    detector = EntityMorphingDetector()
+    asyncio.run(detector.train(X))
+    return detector
+
+
+def test_nan_inputs_get_finite_error_results():
+    detector = _trained_detector()
+    events = [
+        {'entity_id': 'e0', 'activity_count': 21.0, 'error_rate': 2.0, 'login_frequency': 100.0},
+        {'entity_id': 'e1', 'activity_count': float('nan'), 'error_rate': 2.0, 'login_frequency': 100.0},
+        {'entity_id': 'e3', 'activity_count': 21.0, 'error_rate': 2.0, 'login_frequency': 100.0},
+    ]
+    
+    single = [asyncio.run(detector.predict(dict(event))) for event in events]
+    batch = asyncio.run(detector.predict_batch([dict(event) for event in events]))
+    
+    for results in (single, batch):
+        assert all(math.isfinite(result['score']) for result in results)
+        assert 'error' not in results[0]['explanation']
+        for result in results[1:]:
+            assert result['score'] == 0.0
+            assert not result['is_morphing']
+            assert 'error' in result['explanation']
@@ -0,0 +1,65 @@
+"""Round-trip tests for models that memory-map arrays saved next to their pickle."""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from src.models.anomaly.ocsvm import OneClassSVMModel
+from src.models.morphing.entity_morphing_detector import EntityMorphingDetector
+
+
+def _training_frame(n_rows: int = 400) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        rng.normal(size=(n_rows, 4)) * [50, 1, 5, 3] + [100, 0.5, 10, 2],
+        columns=['login_frequency', 'session_time', 'access_count', 'error_rate']
+    )
+
+
+def test_ocsvm_resave_over_memory_mapped_support_vectors(tmp_path):
+    X = _training_frame()
+    model = OneClassSVMModel()
+    model.train(X, cross_validation=False)
+    expected = model.predict(X.iloc[:200])['scores']
+    
+    path = str(tmp_path / 'ocsvm')
+    model.save_model(path)
+    loaded = OneClassSVMModel()
+    loaded.load_model(path)
+    
+    # Saving over the file the loaded model has memory-mapped must not corrupt it
+    loaded.save_model(path)
+    reloaded = OneClassSVMModel()
+    reloaded.load_model(path)
+    
+    assert np.abs(np.load(OneClassSVMModel._support_vectors_path(path))).sum() > 0
+    np.testing.assert_allclose(reloaded.predict(X.iloc[:200])['scores'], expected, rtol=1e-6)
+
+
+def test_entity_morphing_resave_over_memory_mapped_baselines(tmp_path):
+    rng = np.random.default_rng(0)
+    X = _training_frame(600)
+    X['entity_id'] = [f'e{i}' for i in rng.integers(0, 6, len(X))]
+    events = X.sample(n=20, random_state=0).to_dict('records')
+    
+    async def scenario():
+        detector = EntityMorphingDetector()
+        await detector.train(X)
+        expected = await detector.predict_batch(events)
+        
+        path = str(tmp_path / 'morphing')
+        detector.save_model(path)
+        loaded = EntityMorphingDetector()
+        await loaded.load_model(path)
+        
+        # Saving over the file the loaded model has memory-mapped must not corrupt it
+        loaded.save_model(path)
+        reloaded = EntityMorphingDetector()
+        await reloaded.load_model(path)
+        return expected, await reloaded.predict_batch(events)
+    
+    expected, actual = asyncio.run(scenario())
+    
+    assert np.abs(np.load(EntityMorphingDetector._baseline_matrix_path(str(tmp_path / 'morphing')))).sum() > 0
+    np.testing.assert_allclose([r['score'] for r in actual], [r['score'] for r in expected], rtol=1e-6)